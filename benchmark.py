@@ -0,0 +1,487 @@
+# benchmark.py
+"""Benchmarks for the organizer on synthetic libraries.
+
+Generates libraries of noisy release names, with some movies present in
+several qualities, and organizes them against the in-process fake OMDB
+server. Each phase reports wall time, requests, files touched and peak
+RSS; the full run also reports time per pipeline stage. Every library
+size runs in its own process so peak RSS is per size. Results are saved
+as JSON, and ``--compare`` checks them against an earlier file:
+
+    python benchmark.py --sizes 1000 10000 50000 --latency 0.05
+    python benchmark.py --sizes 1000 --compare benchmark_results.json
+
+Phases: ``plan`` (dry run: parsing and rename planning), ``process``
+(full run), ``reprocess`` (incremental run over the organized library)
+and ``load`` (what the browser does to list the library).
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import asyncio
+import argparse
+import tempfile
+import platform
+import contextlib
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from fake_omdb import FakeOmdbServer
+from fetch_scheduler import FetchScheduler
+from library_manifest import LibraryManifest
+from library_walker import load_folders, walk_library
+from metadata_providers import OmdbProvider
+from metadata_store import MetadataStore
+from movie_organizer_core import GENRES, MovieOrganizer
+from release_parser import ParseCache
+from search_index import SearchIndex
+
+PHASES = ["plan", "process", "reprocess", "load"]
+
+# Phase figures compared by --compare, and the least change that counts
+COMPARED = {"wall": 0.05, "requests": 1, "files_touched": 1, "peak_rss_mb": 5.0}
+
+WORDS = """
+    after alien american angel apart arrival autumn black blade blood blue
+    broken brother city cold dark dawn day dead desert devil dream east edge
+    empire escape eternal evening fall fire first forest forgotten ghost glass
+    gold great green heart heat hidden home hour house hunter iron island king
+    last lost love machine man midnight moon mountain night ocean other paper
+    paradise queen rain red return river road secret shadow silent silver sky
+    small star stone storm strange summer sun thunder time tomorrow town true
+    twelve under war water west white wild winter wolf woman world young
+""".split()
+QUALITIES = ["480p", "576p", "720p", "1080p", "2160p"]
+SOURCES = ["BluRay", "WEB-DL", "WEBRip", "HDTV", "DVDRip", "BRRip", "HDRip"]
+CODECS = ["x264", "x265", "HEVC", "H.264", "XviD", "10bit"]
+AUDIO = ["AAC", "DTS", "AC3", "DD5.1", "Atmos", "FLAC"]
+GROUPS = ["SPARKS", "YTS", "RARBG", "FGT", "NTG", "EVO", "GECKOS", "AMIABLE"]
+
+
+def release_name(rng: random.Random, title: str, year: int, quality: str) -> str:
+    """A release folder name with the noise real downloads have"""
+    separator = rng.choice([".", ".", " ", "_"])
+    parts = title.split() + [str(year), quality, rng.choice(SOURCES)]
+    if rng.random() < 0.5:
+        parts.append(rng.choice(AUDIO))
+    parts.append(rng.choice(CODECS))
+    name = separator.join(parts)
+    if rng.random() < 0.7:
+        name += "-" + rng.choice(GROUPS)
+    if rng.random() < 0.1:
+        name = f"[{rng.choice(GROUPS)}] {name}"
+    if rng.random() < 0.1:
+        name = name.lower()
+    return name
+
+
+def generate_library(
+    root: Path, size: int, duplicate_ratio: float = 0.2, seed: int = 0
+) -> int:
+    """Create ``size`` movie folders, each holding an empty video file.
+
+    About ``duplicate_ratio`` of the movies come in two or three qualities.
+    Returns the number of distinct movies.
+    """
+    rng = random.Random(seed)
+    names: Dict[str, None] = {}
+    movies = 0
+    while len(names) < size:
+        title = " ".join(w.capitalize() for w in rng.sample(WORDS, rng.randint(1, 4)))
+        year = rng.randint(1950, 2024)
+        copies = rng.randint(2, 3) if rng.random() < duplicate_ratio else 1
+        for quality in rng.sample(QUALITIES, copies):
+            names[release_name(rng, title, year, quality)] = None
+        movies += 1
+    for name in list(names)[:size]:
+        folder = root / name
+        folder.mkdir()
+        (folder / f"{name}.mkv").touch()
+    return movies
+
+
+def snapshot(root: Path) -> Dict[int, Tuple[int, str, int]]:
+    """inode -> (parent inode, name, ctime) for everything under ``root``"""
+    entries = {}
+    stack = [(root, os.stat(root).st_ino)]
+    while stack:
+        folder, parent = stack.pop()
+        with os.scandir(folder) as listing:
+            for entry in listing:
+                stat = entry.stat(follow_symlinks=False)
+                entries[stat.st_ino] = (parent, entry.name, stat.st_ctime_ns)
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, stat.st_ino))
+    return entries
+
+
+def files_touched(before: Dict, after: Dict) -> int:
+    """Entries created, removed, moved, renamed or modified in between.
+
+    Entries are matched by inode, so moving a folder counts once rather
+    than once for everything inside it.
+    """
+    common = before.keys() & after.keys()
+    changed = sum(1 for ino in common if before[ino] != after[ino])
+    return len(before.keys() ^ after.keys()) + changed
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process or any child so far, in MiB"""
+    if resource is None:
+        return None
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # Linux reports KiB, macOS bytes
+    scale = 1 if sys.platform == "darwin" else 1024
+    return round(peak * scale / 2**20, 1)
+
+
+def make_organizer(fake: FakeOmdbServer, args) -> MovieOrganizer:
+    scheduler = FetchScheduler(
+        max_in_flight=args.concurrency, requests_per_second=None, daily_quota=None
+    )
+    return MovieOrganizer(
+        "benchmark",
+        max_in_flight=args.concurrency,
+        daily_quota=None,
+        io_workers=args.io_workers,
+        providers=[OmdbProvider("benchmark", scheduler, base_url=fake.url)],
+    )
+
+
+async def plan_phase(root: Path, fake: FakeOmdbServer, args) -> Dict:
+    plan = make_organizer(fake, args).plan_movies(root)
+    return {"summary": plan.summary()}
+
+
+async def process_phase(root: Path, fake: FakeOmdbServer, args, incremental=False):
+    organizer = make_organizer(fake, args)
+    async with organizer:
+        result = await organizer.process_movies(root, incremental=incremental)
+    return {
+        "organized": result.organized,
+        "manual_checking": result.manual_checking,
+        "failed": len(result.failed),
+        "stage_times": {
+            name: round(seconds, 3) for name, seconds in result.stage_times.items()
+        },
+    }
+
+
+async def reprocess_phase(root: Path, fake: FakeOmdbServer, args) -> Dict:
+    return await process_phase(root, fake, args, incremental=True)
+
+
+async def load_phase(root: Path, fake: FakeOmdbServer, args) -> Dict:
+    parser = ParseCache(root / "movies info" / "parse_cache.json")
+    search_index = SearchIndex()
+    manifest = LibraryManifest(root)
+    store = MetadataStore.for_library(root)
+    movies = 0
+    for _, folders in walk_library(root):
+        movies += len(load_folders(folders, parser, search_index, manifest, store))
+    return {"movies": movies}
+
+
+PHASE_RUNNERS = {
+    "plan": plan_phase,
+    "process": process_phase,
+    "reprocess": reprocess_phase,
+    "load": load_phase,
+}
+
+
+async def run_phases(root: Path, args) -> Dict:
+    fake = FakeOmdbServer(
+        latency=args.latency, genres=GENRES, poster_size=args.poster_size
+    )
+    await fake.start()
+    results = {}
+    try:
+        for phase in args.phases:
+            before = snapshot(root)
+            requests, posters = fake.requests, fake.poster_requests
+            started = time.perf_counter()
+            extra = await PHASE_RUNNERS[phase](root, fake, args)
+            wall = time.perf_counter() - started
+            results[phase] = {
+                "wall": round(wall, 3),
+                "requests": fake.requests - requests,
+                "poster_requests": fake.poster_requests - posters,
+                "files_touched": files_touched(before, snapshot(root)),
+                "peak_rss_mb": peak_rss_mb(),
+                **extra,
+            }
+    finally:
+        await fake.stop()
+    return results
+
+
+def run_child(size: int, args) -> Dict:
+    """Benchmark one library size in this process"""
+    workdir = Path(tempfile.mkdtemp(prefix=f"movies-{size}-", dir=args.workdir))
+    try:
+        started = time.perf_counter()
+        movies = generate_library(workdir, size, args.duplicates, args.seed)
+        generated = time.perf_counter() - started
+        results = asyncio.run(run_phases(workdir, args))
+    finally:
+        if args.keep:
+            print(f"Library kept in {workdir}", file=sys.stderr)
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        "folders": size,
+        "movies": movies,
+        "generate": round(generated, 3),
+        **results,
+    }
+
+
+def run_size(size: int, args) -> Dict:
+    """Benchmark one library size in a fresh process"""
+    command = [
+        sys.executable,
+        os.path.abspath(__file__),
+        "--child",
+        str(size),
+        "--phases",
+        *args.phases,
+        "--latency",
+        str(args.latency),
+        "--concurrency",
+        str(args.concurrency),
+        "--io-workers",
+        str(args.io_workers),
+        "--duplicates",
+        str(args.duplicates),
+        "--poster-size",
+        str(args.poster_size),
+        "--seed",
+        str(args.seed),
+    ]
+    if args.workdir:
+        command += ["--workdir", str(args.workdir)]
+    if args.keep:
+        command.append("--keep")
+    output = subprocess.run(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=None if args.verbose else subprocess.DEVNULL,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def current_label() -> str:
+    """Short commit hash of the working tree, for labelling results"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_report(report: Dict):
+    settings = ", ".join(f"{k} {v}" for k, v in report["settings"].items())
+    print(f"Benchmark {report['label']} ({settings})")
+    print(
+        f"{'folders':>8} {'phase':<10} {'wall s':>9} {'requests':>9} "
+        f"{'posters':>8} {'touched':>8} {'peak MiB':>9}"
+    )
+    for size, results in report["sizes"].items():
+        for phase in PHASES:
+            if phase not in results:
+                continue
+            r = results[phase]
+            print(
+                f"{size:>8} {phase:<10} {r['wall']:>9.3f} {r['requests']:>9} "
+                f"{r['poster_requests']:>8} {r['files_touched']:>8} "
+                f"{r['peak_rss_mb'] if r['peak_rss_mb'] is not None else '-':>9}"
+            )
+            if r.get("stage_times"):
+                stages = ", ".join(
+                    f"{name} {seconds:.2f}s"
+                    for name, seconds in r["stage_times"].items()
+                )
+                print(f"{'':>8} {'':<10} {stages}")
+
+
+def compare(report: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Figures that got worse by more than ``threshold`` since ``baseline``"""
+    regressions = []
+    for size, results in report["sizes"].items():
+        for phase, figures in results.items():
+            old = baseline.get("sizes", {}).get(size, {}).get(phase)
+            if not isinstance(figures, dict) or not isinstance(old, dict):
+                continue
+            for key, least in COMPARED.items():
+                new_value, old_value = figures.get(key), old.get(key)
+                if new_value is None or old_value is None:
+                    continue
+                if new_value - old_value >= least and new_value > old_value * (
+                    1 + threshold
+                ):
+                    regressions.append(
+                        f"{size} folders, {phase}: {key} {old_value} -> {new_value}"
+                    )
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark the organizer on synthetic libraries."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1000],
+        help="library sizes in folders (default: 1000)",
+    )
+    parser.add_argument(
+        "--phases",
+        nargs="+",
+        choices=PHASES,
+        default=PHASES,
+        help="phases to run, in order (default: all)",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.05,
+        help="seconds the fake OMDB server takes per reply (default: 0.05)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="OMDB requests in flight at once (default: 8)",
+    )
+    parser.add_argument(
+        "--io-workers",
+        type=int,
+        default=8,
+        help="threads for moves and other file work (default: 8)",
+    )
+    parser.add_argument(
+        "--duplicates",
+        type=float,
+        default=0.2,
+        help="share of movies present in several qualities (default: 0.2)",
+    )
+    parser.add_argument(
+        "--poster-size",
+        type=int,
+        default=8 * 1024,
+        help="bytes per fake poster (default: 8192)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="name generator seed")
+    parser.add_argument(
+        "--workdir", type=Path, help="where to create the libraries (default: temp)"
+    )
+    parser.add_argument(
+        "--keep", action="store_true", help="keep the generated libraries"
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("benchmark_results.json"),
+        help="file to save the results to (default: benchmark_results.json)",
+    )
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        metavar="FILE",
+        help="earlier results to check for regressions; exits 1 if any",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative change --compare reports as a regression (default: 0.1)",
+    )
+    parser.add_argument("--label", help="name for these results (default: commit)")
+    parser.add_argument(
+        "--verbose", action="store_true", help="show the organizer's own output"
+    )
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.compare and args.compare.resolve() == args.output.resolve():
+        parser.error("--compare and --output must be different files")
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.child:
+        # Keep stdout for the result line only
+        with contextlib.redirect_stdout(sys.stderr):
+            results = run_child(args.child, args)
+        print(json.dumps(results))
+        return 0
+
+    baseline = None
+    if args.compare:
+        # Read before anything is written
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    report = {
+        "label": args.label or current_label(),
+        "created": time.time(),
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "settings": {
+            "latency": args.latency,
+            "concurrency": args.concurrency,
+            "io_workers": args.io_workers,
+            "duplicates": args.duplicates,
+            "seed": args.seed,
+        },
+        "sizes": {},
+    }
+    for size in args.sizes:
+        print(f"Benchmarking {size} folders...", file=sys.stderr)
+        report["sizes"][str(size)] = run_size(size, args)
+
+    print_report(report)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to {args.output}")
+
+    if baseline is not None:
+        regressions = compare(report, baseline, args.threshold)
+        print(f"Compared with {baseline.get('label', args.compare)}:")
+        for regression in regressions:
+            print(f"  regressed: {regression}")
+        if regressions:
+            return 1
+        print("  no regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+# duplicate_index.py
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+QUALITY_PATTERN = re.compile(r"\b(2160p|1080p|720p|576p|480p)\b", re.IGNORECASE)
+
+
+def base_title(name: str) -> str:
+    """Normalize a folder name to a title with quality markers removed"""
+    name = QUALITY_PATTERN.sub(" ", name.lower())
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", name).split())
+
+
+@dataclass
+class DuplicateRecord:
+    discarded: Path
+    kept: Path
+    key: str
+
+
+class DuplicateIndex:
+    """Hash-indexed duplicate detection keeping the best quality per movie.
+
+    Movies are keyed on their IMDb ID when known and on the normalized base
+    title otherwise. A title-only entry merges with an IMDb-keyed entry of
+    the same title, but two different IMDb IDs never merge (remakes).
+    Every insert is O(1); removing a kept copy promotes the best remaining
+    duplicate.
+    """
+
+    def __init__(self, quality_of: Callable[[Path], int]):
+        self.quality_of = quality_of
+        self._kept: Dict[str, Path] = {}
+        self._quality: Dict[str, int] = {}
+        self._imdb: Dict[str, Optional[str]] = {}
+        self._by_title: Dict[str, str] = {}
+        self._by_imdb: Dict[str, str] = {}
+        self._key_of: Dict[Path, str] = {}
+        self.duplicates: List[DuplicateRecord] = []
+
+    def _resolve(self, title: str, imdb_id: Optional[str]) -> str:
+        """Find or create the canonical key for a movie"""
+        if imdb_id:
+            key = self._by_imdb.get(imdb_id)
+            if key is None:
+                key = self._by_title.get(title)
+                if key is None or self._imdb[key] not in (None, imdb_id):
+                    key = f"imdb:{imdb_id}"
+                    self._imdb[key] = imdb_id
+                    self._by_title.setdefault(title, key)
+                else:
+                    self._imdb[key] = imdb_id
+                self._by_imdb[imdb_id] = key
+            return key
+
+        key = self._by_title.get(title)
+        if key is None:
+            key = f"title:{title}"
+            self._imdb[key] = None
+            self._by_title[title] = key
+        return key
+
+    def add(self, path: Path, imdb_id: Optional[str] = None) -> bool:
+        """Insert a movie folder; return False if it lost to a better copy"""
+        path = Path(path)
+        key = self._resolve(base_title(path.name), imdb_id)
+        quality = self.quality_of(path)
+        self._key_of[path] = key
+
+        existing = self._kept.get(key)
+        if existing is None:
+            self._kept[key] = path
+            self._quality[key] = quality
+            return True
+        if quality > self._quality[key]:
+            self.duplicates.append(DuplicateRecord(existing, path, key))
+            self._kept[key] = path
+            self._quality[key] = quality
+            return True
+        self.duplicates.append(DuplicateRecord(path, existing, key))
+        return False
+
+    def remove(self, path: Path) -> Optional[Path]:
+        """Forget a movie folder; return the duplicate promoted in its place"""
+        path = Path(path)
+        key = self._key_of.pop(path, None)
+        if key is None:
+            return None
+        self.duplicates = [r for r in self.duplicates if r.discarded != path]
+        if self._kept.get(key) != path:
+            return None
+
+        del self._kept[key]
+        del self._quality[key]
+        candidates = [r.discarded for r in self.duplicates if r.key == key]
+        if not candidates:
+            return None
+        best = max(candidates, key=self.quality_of)
+        self.duplicates = [r for r in self.duplicates if r.discarded != best]
+        for record in self.duplicates:
+            if record.key == key:
+                record.kept = best
+        self._kept[key] = best
+        self._quality[key] = self.quality_of(best)
+        return best
+
+    def movies(self) -> List[Path]:
+        """Best copy of every movie, in first-seen order"""
+        return list(self._kept.values())
+
+    def report(self) -> List[Dict[str, str]]:
+        """Discarded duplicates and the copy that was kept instead"""
+        return [
+            {"discarded": str(r.discarded), "kept": str(r.kept), "key": r.key}
+            for r in self.duplicates
+        ]
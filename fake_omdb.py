@@ -0,0 +1,134 @@
+# fake_omdb.py
+import zlib
+import asyncio
+from aiohttp import web
+from typing import Dict, Iterable, List, Optional
+from omdb_cache import normalize_title
+
+DEFAULT_GENRES = ["Action", "Comedy", "Drama", "Horror", "Sci-Fi", "Thriller"]
+
+
+class FakeOmdbServer:
+    """In-process stand-in for the OMDB API and its poster host.
+
+    Serves ``i=``, ``t=`` and ``s=`` queries from the given records and,
+    with ``synthesize``, makes up a stable record for any other title, so
+    runs can be tested and timed without the network. Every answer is
+    delayed by ``latency`` seconds; after ``quota`` requests it answers
+    like OMDB does once the daily limit is reached. Posters are served
+    from ``/posters/<imdb id>.jpg``.
+    """
+
+    def __init__(
+        self,
+        records: Iterable[Dict] = (),
+        synthesize: bool = True,
+        latency: float = 0.0,
+        quota: Optional[int] = None,
+        genres: List[str] = DEFAULT_GENRES,
+        poster_size: int = 30 * 1024,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.records: Dict[str, Dict] = {}
+        self.by_title: Dict[str, List[str]] = {}
+        self.synthesize = synthesize
+        self.latency = latency
+        self.quota = quota
+        self.genres = genres
+        self.poster_size = poster_size
+        self.host = host
+        self.port = port
+        self.url = None
+        self.requests = 0
+        self.poster_requests = 0
+        self._runner = None
+        for record in records:
+            self.add(record)
+
+    def add(self, record: Dict):
+        self.records[record["imdbID"]] = record
+        self.by_title.setdefault(normalize_title(record["Title"]), []).append(
+            record["imdbID"]
+        )
+
+    def _synthesize(self, title: str, year: Optional[str]) -> Dict:
+        seed = zlib.crc32(normalize_title(title).encode())
+        imdb_id = f"tt{seed % 10**8:08d}"
+        record = {
+            "Title": title,
+            "Year": str(year or 1950 + seed % 75),
+            "Genre": self.genres[seed % len(self.genres)],
+            "Runtime": f"{80 + seed % 80} min",
+            "imdbRating": f"{1 + seed % 90 / 10:.1f}",
+            "imdbID": imdb_id,
+            "Type": "movie",
+            "Poster": f"{self.url}posters/{imdb_id}.jpg",
+            "Response": "True",
+        }
+        self.add(record)
+        return record
+
+    def _lookup(self, query) -> Dict:
+        if query.get("i"):
+            record = self.records.get(query["i"])
+            return record or {"Response": "False", "Error": "Incorrect IMDb ID."}
+
+        title = query.get("t") or query.get("s") or ""
+        year = query.get("y")
+        matches = [
+            self.records[imdb_id]
+            for imdb_id in self.by_title.get(normalize_title(title), [])
+            if not year or self.records[imdb_id]["Year"][:4] == year
+        ]
+        if not matches and self.synthesize and title:
+            matches = [self._synthesize(title, year)]
+        if not matches:
+            return {"Response": "False", "Error": "Movie not found!"}
+        if query.get("s"):
+            fields = ("Title", "Year", "imdbID", "Type")
+            return {
+                "Search": [{key: m.get(key) for key in fields} for m in matches],
+                "Response": "True",
+            }
+        return matches[0]
+
+    async def _omdb(self, request):
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.quota is not None and self.requests > self.quota:
+            return web.json_response(
+                {"Response": "False", "Error": "Request limit reached!"}
+            )
+        return web.json_response(self._lookup(request.query))
+
+    async def _poster(self, request):
+        self.poster_requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if request.headers.get("If-None-Match") == '"fake"':
+            return web.Response(status=304)
+        # Enough of a JPEG for anything that only checks the markers
+        body = b"\xff\xd8" + b"\0" * max(0, self.poster_size - 4) + b"\xff\xd9"
+        return web.Response(
+            body=body, content_type="image/jpeg", headers={"ETag": '"fake"'}
+        )
+
+    async def start(self) -> str:
+        """Start serving; returns the base URL to query"""
+        app = web.Application()
+        app.router.add_get("/", self._omdb)
+        app.router.add_get("/posters/{name}", self._poster)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{self.host}:{port}/"
+        return self.url
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
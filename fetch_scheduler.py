@@ -0,0 +1,170 @@
+# fetch_scheduler.py
+import os
+import json
+import time
+import asyncio
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import date
+from pathlib import Path
+from typing import Callable, Deque, List, Optional
+
+# Latency percentiles cover this many of the most recent requests
+LATENCY_WINDOW = 1000
+# Throughput reports are sent at most this often, in seconds
+REPORT_INTERVAL = 1.0
+
+
+class QuotaExhausted(Exception):
+    """Raised when the daily request quota has been used up"""
+
+
+class FetchScheduler:
+    """Bounded-concurrency, rate-limited scheduler for OMDB requests.
+
+    Network requests go through ``request_slot()``, which enforces the
+    in-flight limit, a token bucket of ``requests_per_second`` and the daily
+    quota. Throughput is measured from the first request.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 8,
+        requests_per_second: float = 10.0,
+        daily_quota: Optional[int] = 1000,
+        quota_path: Optional[Path] = None,
+        progress_callback: Callable = None,
+    ):
+        self.max_in_flight = max(1, max_in_flight)
+        self.requests_per_second = requests_per_second
+        self.daily_quota = daily_quota
+        self.quota_path = Path(quota_path) if quota_path else None
+        self.progress_callback = progress_callback or (lambda x, y: None)
+        self.logger = logging.getLogger(__name__)
+
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        self._bucket_lock = asyncio.Lock()
+        self._burst = max(1.0, requests_per_second or 1.0)
+        self._tokens = self._burst
+        self._last_refill = time.monotonic()
+
+        self.exhausted = False
+        self.requests_made = 0
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._started = None
+        self._last_report = None
+
+        self.quota_day = date.today().isoformat()
+        self.quota_used = 0
+        self._load_quota()
+
+    def _load_quota(self):
+        if not self.quota_path or not self.quota_path.exists():
+            return
+        try:
+            with open(self.quota_path, encoding="utf-8") as f:
+                stored = json.load(f)
+            if stored.get("date") == self.quota_day:
+                self.quota_used = int(stored.get("used", 0))
+        except Exception as e:
+            self.logger.error(f"Error loading quota {self.quota_path}: {e}")
+
+    def save_quota(self):
+        """Persist today's request count so the next run honours it"""
+        if not self.quota_path:
+            return
+        try:
+            tmp_path = self.quota_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"date": self.quota_day, "used": self.quota_used}, f)
+            os.replace(tmp_path, self.quota_path)
+        except Exception as e:
+            self.logger.error(f"Error saving quota {self.quota_path}: {e}")
+
+    @property
+    def quota_remaining(self) -> Optional[int]:
+        if self.daily_quota is None:
+            return None
+        return max(0, self.daily_quota - self.quota_used)
+
+    def mark_exhausted(self):
+        """Stop issuing requests for the rest of the day"""
+        self.exhausted = True
+        if self.daily_quota is not None:
+            self.quota_used = max(self.quota_used, self.daily_quota)
+        self.save_quota()
+
+    async def _take_token(self):
+        if not self.requests_per_second:
+            return
+        async with self._bucket_lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._burst,
+                    self._tokens + (now - self._last_refill) * self.requests_per_second,
+                )
+                self._last_refill = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.requests_per_second)
+
+    @asynccontextmanager
+    async def request_slot(self):
+        """Reserve an in-flight slot and a rate token for one network request"""
+        async with self._semaphore:
+            if self.exhausted or self.quota_remaining == 0:
+                self.exhausted = True
+                raise QuotaExhausted("Daily OMDB quota reached")
+            await self._take_token()
+            self._started = self._started or time.monotonic()
+            self.quota_used += 1
+            self.requests_made += 1
+            started = time.monotonic()
+            try:
+                yield
+            finally:
+                self.latencies.append(time.monotonic() - started)
+
+    def requests_per_second_observed(self) -> float:
+        if not self._started or not self.requests_made:
+            return 0.0
+        elapsed = time.monotonic() - self._started
+        return self.requests_made / elapsed if elapsed > 0 else 0.0
+
+    def latency_percentiles(self, *percentiles: float) -> List[float]:
+        """Return the given latency percentiles in milliseconds"""
+        if not self.latencies:
+            return [0.0 for _ in percentiles]
+        ordered = sorted(self.latencies)
+        last = len(ordered) - 1
+        return [
+            ordered[min(last, int(round(p / 100 * last)))] * 1000 for p in percentiles
+        ]
+
+    def latency_percentile(self, percentile: float) -> float:
+        """Return the given latency percentile in milliseconds"""
+        return self.latency_percentiles(percentile)[0]
+
+    def report_throughput(self, force: bool = False):
+        """Send throughput and latency figures to the progress callback.
+
+        Reports closer together than REPORT_INTERVAL are skipped unless
+        ``force`` is set.
+        """
+        now = time.monotonic()
+        if (
+            not force
+            and self._last_report is not None
+            and now - self._last_report < REPORT_INTERVAL
+        ):
+            return
+        self._last_report = now
+        p50, p95 = self.latency_percentiles(50, 95)
+        self.progress_callback("throughput", self.requests_per_second_observed())
+        self.progress_callback("latency_p50", p50)
+        self.progress_callback("latency_p95", p95)
+        if self.daily_quota is not None:
+            self.progress_callback("quota_remaining", self.quota_remaining)
@@ -0,0 +1,66 @@
+# library_loader.py
+from PySide6.QtCore import QThread, Signal
+from pathlib import Path
+from library_manifest import LibraryManifest
+from library_walker import load_folders, walk_library
+from metadata_store import MetadataStore
+
+
+class LibraryLoader(QThread):
+    """Walks a library off the GUI thread and streams movies as they're found.
+
+    For every genre folder it parses the folder names, looks up metadata,
+    builds sort records and indexes the movies for search, then emits
+    ``batch_ready(generation, [(path, imdb_id, record), ...])``. The
+    generation number lets the browser ignore a loader it has replaced.
+    Given ``folders``, only those are loaded, as a single batch, reusing
+    ``manifest`` if one was already loaded.
+    """
+
+    batch_ready = Signal(int, object)
+    finished_loading = Signal(int)
+
+    def __init__(
+        self,
+        root,
+        generation,
+        parser,
+        search_index,
+        parent=None,
+        folders=None,
+        manifest=None,
+    ):
+        super().__init__(parent)
+        self.root = Path(root)
+        self.generation = generation
+        self.parser = parser
+        self.search_index = search_index
+        self.folders = folders
+        self.manifest = manifest
+
+    def run(self):
+        try:
+            if self.manifest is None:
+                self.manifest = LibraryManifest(self.root)
+            else:
+                # The organizer may have recorded folders since it was read
+                self.manifest.refresh()
+            store = MetadataStore.for_library(self.root)
+            if self.folders is None:
+                groups = walk_library(self.root)
+            else:
+                groups = [(None, self.folders)]
+            for genre_folder, folders in groups:
+                if self.isInterruptionRequested():
+                    return
+                if genre_folder is not None:
+                    print(f"Scanning folder: {genre_folder.name}")
+                batch = load_folders(
+                    folders, self.parser, self.search_index, self.manifest, store
+                )
+                self.batch_ready.emit(self.generation, batch)
+            self.parser.save()
+        except Exception as e:
+            print(f"Error loading library {self.root}: {e}")
+        finally:
+            self.finished_loading.emit(self.generation)
@@ -0,0 +1,157 @@
+# library_manifest.py
+import os
+import json
+import hashlib
+import logging
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, Optional
+
+
+@dataclass
+class ManifestEntry:
+    path: str
+    inode: int
+    mtime: float
+    size: int
+    content_hash: str
+    imdb_id: Optional[str] = None
+
+
+def fingerprint(path: Path) -> Dict:
+    """Stat a movie folder and hash its top-level listing"""
+    stat = path.stat()
+    size = 0
+    listing = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                entry_stat = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            if entry.is_file(follow_symlinks=False):
+                size += entry_stat.st_size
+            listing.append(
+                f"{entry.name}:{entry_stat.st_size}:{entry_stat.st_mtime_ns}"
+            )
+    listing.sort()
+    return {
+        "inode": stat.st_ino,
+        "mtime": stat.st_mtime,
+        "size": size,
+        "content_hash": hashlib.sha1("\n".join(listing).encode()).hexdigest(),
+    }
+
+
+class LibraryManifest:
+    """Record of every folder the organizer has already processed.
+
+    Entries are keyed on the folder path relative to the library root and
+    stored in ``movies info/library_manifest.json``.
+    """
+
+    def __init__(self, root: Path, manifest_path: Path = None):
+        self.root = Path(root)
+        self.manifest_path = manifest_path or (
+            self.root / "movies info" / "library_manifest.json"
+        )
+        self.logger = logging.getLogger(__name__)
+        self.entries: Dict[str, ManifestEntry] = {}
+        self._dirty = False
+        self._loaded_mtime = None
+        self.load()
+
+    def _key(self, path: Path) -> str:
+        try:
+            return Path(path).relative_to(self.root).as_posix()
+        except ValueError:
+            return Path(path).as_posix()
+
+    def _file_mtime(self) -> Optional[int]:
+        try:
+            return self.manifest_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def load(self):
+        """Load the manifest from disk"""
+        self._loaded_mtime = self._file_mtime()
+        if self._loaded_mtime is None:
+            return
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                stored = json.load(f)
+            entries = {}
+            for item in stored.get("entries", []):
+                entry = ManifestEntry(**item)
+                entries[entry.path] = entry
+            self.entries = entries
+        except Exception as e:
+            self.logger.error(f"Error loading manifest {self.manifest_path}: {e}")
+            self.entries = {}
+
+    def refresh(self) -> bool:
+        """Reload the manifest if another process saved it since it was read"""
+        if self._dirty or self._file_mtime() == self._loaded_mtime:
+            return False
+        self.load()
+        return True
+
+    def save(self):
+        """Write the manifest to disk if it changed"""
+        if not self._dirty:
+            return
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "version": 1,
+                        "entries": [asdict(e) for e in self.entries.values()],
+                    },
+                    f,
+                    ensure_ascii=False,
+                )
+            os.replace(tmp_path, self.manifest_path)
+            self._dirty = False
+            self._loaded_mtime = self._file_mtime()
+        except Exception as e:
+            self.logger.error(f"Error saving manifest {self.manifest_path}: {e}")
+
+    def get(self, path: Path) -> Optional[ManifestEntry]:
+        return self.entries.get(self._key(path))
+
+    def is_changed(self, path: Path) -> bool:
+        """Return True if the folder is new or differs from its manifest entry"""
+        entry = self.get(path)
+        if entry is None:
+            return True
+        try:
+            current = fingerprint(path)
+        except OSError:
+            return True
+        return (
+            current["inode"] != entry.inode
+            or current["mtime"] != entry.mtime
+            or current["size"] != entry.size
+            or current["content_hash"] != entry.content_hash
+        )
+
+    def record(self, path: Path, imdb_id: Optional[str] = None):
+        """Store the current fingerprint of a processed folder"""
+        try:
+            current = fingerprint(path)
+        except OSError as e:
+            self.logger.error(f"Error fingerprinting {path}: {e}")
+            return
+        key = self._key(path)
+        previous = self.entries.get(key)
+        if imdb_id is None and previous is not None:
+            imdb_id = previous.imdb_id
+        self.entries[key] = ManifestEntry(path=key, imdb_id=imdb_id, **current)
+        self._dirty = True
+
+    def forget(self, path: Path):
+        """Drop the entry for a folder that was moved or removed"""
+        if self.entries.pop(self._key(path), None) is not None:
+            self._dirty = True
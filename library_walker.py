@@ -0,0 +1,82 @@
+# library_walker.py
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple
+from release_parser import quality_level
+from sort_filter import build_record
+
+SPECIAL_FOLDERS = {"movies info", "Manual Checking"}
+
+
+def list_subdirs(path: Path, exclude: Iterable[str] = ()) -> List[Path]:
+    """List the sub-folders of ``path`` in one scandir pass.
+
+    Uses the file type scandir already read with the directory listing, so
+    no extra stat is made per entry on filesystems that report it.
+    """
+    exclude = set(exclude)
+    folders = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir() and entry.name not in exclude:
+                        folders.append(Path(entry.path))
+                except OSError:
+                    continue
+    except OSError as e:
+        print(f"Error scanning folder {path}: {e}")
+    return folders
+
+
+def walk_library(
+    root: Path, max_workers: int = 8, exclude: Iterable[str] = SPECIAL_FOLDERS
+) -> Iterator[Tuple[Path, List[Path]]]:
+    """Yield (genre folder, movie folders) pairs as each genre is listed.
+
+    Genre folders are listed concurrently, which hides per-folder latency
+    on network shares; results come back in completion order.
+    """
+    genre_folders = list_subdirs(Path(root), exclude)
+    if not genre_folders:
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(genre_folders))) as pool:
+        futures = {
+            pool.submit(list_subdirs, folder): folder for folder in genre_folders
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def _folder_mtime(path):
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return 0.0
+
+
+def load_folders(folders, parser, search_index, manifest, store):
+    """Build (path, imdb_id, record) entries for movie folders.
+
+    Parses the names in one batch, reads their metadata in one query and
+    adds any folder the search index doesn't know yet.
+    """
+    folders = list(folders)
+    parser.parse_many(p.name for p in folders)
+    metadata = store.get_many(p.name for p in folders)
+
+    batch = []
+    for path in folders:
+        entry = manifest.get(path)
+        data = metadata.get(path.name)
+        record = build_record(
+            path,
+            data,
+            quality_level(parser.parse(path.name)),
+            entry.mtime if entry else _folder_mtime(path),
+        )
+        if path not in search_index:
+            search_index.add(path, data, path.name)
+        batch.append((path, entry.imdb_id if entry else None, record))
+    return batch
@@ -0,0 +1,145 @@
+# library_watcher.py
+from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer, Signal
+from pathlib import Path
+from typing import Dict, Iterable, Set
+from library_walker import SPECIAL_FOLDERS, list_subdirs
+
+
+def _mtime(path):
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+class LibraryWatcher(QObject):
+    """Watches a library root and its genre folders for movie folder changes.
+
+    Uses QFileSystemWatcher (inotify on Linux) and falls back to polling
+    folder mtimes when a folder can't be watched, e.g. on some network
+    shares. Bursts of events are coalesced and only the folders that
+    changed are rescanned. Movie folders that appeared or vanished in a
+    genre folder are reported through ``folders_changed(added, removed)``;
+    a move between genres shows up as a removal plus an addition.
+    New top-level folders that aren't genre folders are unorganized drops
+    and come through ``folders_dropped``.
+    """
+
+    folders_changed = Signal(list, list)
+    folders_dropped = Signal(list)
+
+    COALESCE_MS = 500
+    POLL_INTERVAL_MS = 5000
+
+    def __init__(self, genres: Iterable[str], parent=None, polling=False):
+        super().__init__(parent)
+        self.genres = set(genres)
+        self.polling = polling
+        self.root = None
+        self.snapshot: Dict[Path, Set[Path]] = {}
+        self.mtimes: Dict[Path, int] = {}
+        self.dirty: Set[Path] = set()
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.mark_dirty)
+        self.coalesce_timer = QTimer(self)
+        self.coalesce_timer.setSingleShot(True)
+        self.coalesce_timer.setInterval(self.COALESCE_MS)
+        self.coalesce_timer.timeout.connect(self.flush)
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(self.POLL_INTERVAL_MS)
+        self.poll_timer.timeout.connect(self.poll)
+
+    def watch(self, root, folders: Iterable[Path] = ()):
+        """Start watching ``root``; ``folders`` are the movie folders already shown"""
+        self.stop()
+        self.root = Path(root)
+        self.snapshot[self.root] = set(list_subdirs(self.root, SPECIAL_FOLDERS))
+        for folder in self.snapshot[self.root]:
+            if folder.name in self.genres:
+                self.snapshot[folder] = set()
+        for path in folders:
+            path = Path(path)
+            if path.parent != self.root and path.parent in self.snapshot:
+                self.snapshot[path.parent].add(path)
+        self._watch_folders(list(self.snapshot))
+
+    def stop(self):
+        """Stop watching and forget the snapshot"""
+        directories = self.watcher.directories()
+        if directories:
+            self.watcher.removePaths(directories)
+        self.coalesce_timer.stop()
+        self.poll_timer.stop()
+        self.root = None
+        self.snapshot.clear()
+        self.mtimes.clear()
+        self.dirty.clear()
+
+    def _watch_folders(self, folders):
+        for folder in folders:
+            self.mtimes[folder] = _mtime(folder)
+        failed = folders
+        if not self.polling:
+            failed = self.watcher.addPaths([str(f) for f in folders])
+        if failed and not self.poll_timer.isActive():
+            print(f"Watching {len(failed)} folders by polling instead")
+            self.poll_timer.start()
+
+    def _unwatch_folder(self, folder):
+        self.mtimes.pop(folder, None)
+        if str(folder) in self.watcher.directories():
+            self.watcher.removePath(str(folder))
+
+    def mark_dirty(self, path):
+        """Remember a changed folder and schedule one rescan for the burst"""
+        self.dirty.add(Path(path))
+        if not self.coalesce_timer.isActive():
+            self.coalesce_timer.start()
+
+    def poll(self):
+        """Fallback: rescan folders whose mtime changed since the last look"""
+        for folder in list(self.snapshot):
+            if _mtime(folder) != self.mtimes.get(folder):
+                self.mark_dirty(folder)
+
+    def flush(self):
+        """Rescan the changed folders and report the differences"""
+        if self.root is None:
+            return
+        dirty, self.dirty = self.dirty, set()
+        added, removed, dropped = [], [], []
+
+        if self.root in dirty:
+            current = set(list_subdirs(self.root, SPECIAL_FOLDERS))
+            previous = self.snapshot[self.root]
+            for folder in previous - current:
+                if folder in self.snapshot:
+                    removed.extend(self.snapshot.pop(folder))
+                    self._unwatch_folder(folder)
+            new_genres = []
+            for folder in current - previous:
+                if folder.name in self.genres:
+                    self.snapshot[folder] = set()
+                    new_genres.append(folder)
+                    dirty.add(folder)
+                else:
+                    dropped.append(folder)
+            self.snapshot[self.root] = current
+            self.mtimes[self.root] = _mtime(self.root)
+            self._watch_folders(new_genres)
+
+        for folder in dirty - {self.root}:
+            if folder not in self.snapshot:
+                continue
+            current = set(list_subdirs(folder))
+            previous = self.snapshot[folder]
+            added.extend(current - previous)
+            removed.extend(previous - current)
+            self.snapshot[folder] = current
+            self.mtimes[folder] = _mtime(folder)
+
+        if added or removed:
+            self.folders_changed.emit(sorted(added), sorted(removed))
+        if dropped:
+            self.folders_dropped.emit(sorted(dropped))
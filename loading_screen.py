@@ -1,8 +1,34 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QProgressBar, QFrame
-from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QProgressBar,
+    QFrame,
+    QPushButton,
+)
+from PySide6.QtCore import Qt, Signal
 
 
 class LoadingScreen(QFrame):
+    pause_toggled = Signal(bool)
+    cancel_requested = Signal()
+
+    BUTTON_STYLE = """
+        QPushButton {
+            padding: 5px 15px;
+            border: 1px solid #ccc;
+            border-radius: 3px;
+            background-color: #f5f5f5;
+        }
+        QPushButton:hover {
+            background-color: #e8e8e8;
+        }
+        QPushButton:disabled {
+            color: #aaa;
+        }
+    """
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setFrameStyle(QFrame.Panel | QFrame.Raised)
@@ -71,27 +97,113 @@ class LoadingScreen(QFrame):
         self.progress_bar.setMaximum(100)
         self.progress_bar.setTextVisible(True)
 
+        # Stats label for counters reported alongside progress
+        self.stats = {}
+        self.stats_label = QLabel("")
+        self.stats_label.setStyleSheet(
+            """
+            QLabel {
+                font-size: 12px;
+                color: #888;
+                margin-top: 5px;
+            }
+        """
+        )
+        self.stats_label.setAlignment(Qt.AlignCenter)
+
+        # Pause/resume and cancel; the run stops at the next safe point
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        self.pause_button = QPushButton("Pause")
+        self.pause_button.setCheckable(True)
+        self.pause_button.setStyleSheet(self.BUTTON_STYLE)
+        self.pause_button.toggled.connect(self.on_pause_toggled)
+        button_layout.addWidget(self.pause_button)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setStyleSheet(self.BUTTON_STYLE)
+        self.cancel_button.clicked.connect(self.on_cancel_clicked)
+        button_layout.addWidget(self.cancel_button)
+        button_layout.addStretch()
+
         # Add widgets to layout
         layout.addStretch()
         layout.addWidget(self.title_label)
         layout.addWidget(self.status_label)
         layout.addWidget(self.progress_bar)
+        layout.addWidget(self.stats_label)
+        layout.addLayout(button_layout)
         layout.addStretch()
 
         # Set fixed size for the loading screen
-        self.setFixedSize(400, 200)
+        self.setFixedSize(400, 250)
+        self.stopping = False
+
+    def reset(self):
+        """Get ready for a new run"""
+        self.stopping = False
+        self.title_label.setText("Organizing Movies")
+        self.stats.clear()
+        self.stats_label.setText("")
+        self.status_label.setText("Initializing...")
+        self.progress_bar.setValue(0)
+        self.pause_button.blockSignals(True)
+        self.pause_button.setChecked(False)
+        self.pause_button.setText("Pause")
+        self.pause_button.blockSignals(False)
+        self.pause_button.setEnabled(True)
+        self.cancel_button.setEnabled(True)
+
+    def on_pause_toggled(self, paused):
+        self.pause_button.setText("Resume" if paused else "Pause")
+        self.title_label.setText("Paused" if paused else "Organizing Movies")
+        self.pause_toggled.emit(paused)
+
+    def on_cancel_clicked(self):
+        self.show_stopping()
+        self.cancel_requested.emit()
+
+    def show_stopping(self):
+        """Show that the run is finishing its current step before stopping"""
+        self.stopping = True
+        self.pause_button.setEnabled(False)
+        self.cancel_button.setEnabled(False)
+        self.title_label.setText("Stopping")
+        self.status_label.setText("Finishing the current step...")
+
+    # Operations that carry a counter rather than a percentage
+    STAT_FORMATS = {
+        "cache_hits": "Cache hits: {:.0f}",
+        "cache_misses": "Cache misses: {:.0f}",
+        "throughput": "{:.1f} req/s",
+        "latency_p50": "p50 {:.0f} ms",
+        "latency_p95": "p95 {:.0f} ms",
+        "quota_remaining": "Quota left: {:.0f}",
+    }
 
     def update_status(self, operation, progress):
         """Update the loading screen with current status"""
+        if operation in self.STAT_FORMATS:
+            self.stats[operation] = progress
+            self.stats_label.setText(
+                "  |  ".join(
+                    self.STAT_FORMATS[key].format(value)
+                    for key, value in self.stats.items()
+                )
+            )
+            return
+
         operations = {
             "renaming": "Renaming movie folders...",
             "scanning": "Scanning files...",
             "fetching": "Fetching movie information...",
+            "posters": "Downloading posters...",
+            "saving": "Saving movie information...",
             "organizing": "Organizing files...",
             "cleaning": "Cleaning up...",
         }
 
-        self.status_label.setText(operations.get(operation, operation))
+        if not self.stopping:
+            self.status_label.setText(operations.get(operation, operation))
         self.progress_bar.setValue(int(progress))
 
     def center_on_parent(self):
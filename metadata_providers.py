@@ -0,0 +1,237 @@
+# metadata_providers.py
+import json
+import asyncio
+import sqlite3
+import logging
+import threading
+import aiohttp
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from fetch_scheduler import FetchScheduler, QuotaExhausted
+from omdb_cache import normalize_title
+
+OMDB_URL = "http://www.omdbapi.com/"
+LOCAL_METADATA = "local_metadata.db"
+NOT_FOUND = {"Response": "False", "Error": "Movie not found!"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    imdb_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    year TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_title ON records (title);
+"""
+
+
+class LookupFailed(Exception):
+    """Raised when no metadata provider could answer a lookup"""
+
+
+def found(answer: Optional[Dict]) -> bool:
+    return bool(answer) and answer.get("Response") == "True"
+
+
+class MetadataProvider(ABC):
+    """A source of OMDB-shaped answers to ``i=``, ``t=`` and ``s=`` queries.
+
+    ``query`` returns the answer (``"Response": "False"`` when the source
+    has nothing), None when the source couldn't be asked, and raises
+    QuotaExhausted once the source is out of requests for the day. Every
+    request goes through the provider's own scheduler, so concurrency,
+    rate and quota limits are per provider.
+    """
+
+    name = "provider"
+
+    def __init__(self, scheduler: Optional[FetchScheduler] = None):
+        self.scheduler = scheduler
+
+    @abstractmethod
+    async def query(self, params: Dict) -> Optional[Dict]:
+        """Answer one OMDB-style query"""
+
+    async def close(self):
+        pass
+
+
+class OmdbProvider(MetadataProvider):
+    """The OMDB API, or any server answering like it (a mirror, a fake)"""
+
+    name = "omdb"
+
+    def __init__(
+        self,
+        api_key: str,
+        scheduler: Optional[FetchScheduler] = None,
+        base_url: str = OMDB_URL,
+        retries: int = 3,
+    ):
+        super().__init__(scheduler)
+        self.api_key = api_key
+        self.base_url = base_url
+        self.retries = retries
+        self.logger = logging.getLogger(__name__)
+        self.session = None
+
+    async def query(self, params: Dict) -> Optional[Dict]:
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.scheduler.max_in_flight)
+            )
+        params = {key: value for key, value in params.items() if value}
+        params["apikey"] = self.api_key or ""
+        for attempt in range(self.retries):
+            try:
+                async with self.scheduler.request_slot(), self.session.get(
+                    self.base_url, params=params
+                ) as response:
+                    status = response.status
+                    try:
+                        data = await response.json(content_type=None)
+                    except ValueError:
+                        data = None
+            except QuotaExhausted:
+                raise
+            except Exception as e:
+                self.logger.error(f"Error querying {self.base_url}: {str(e)}")
+                await asyncio.sleep(2**attempt)  # Exponential backoff
+                continue
+            if not isinstance(data, dict):
+                data = None
+            # OMDB reports the daily limit with a 401, not only a 200
+            error = data.get("Error", "") if data else ""
+            if data and data.get("Response") != "True" and "limit" in error.lower():
+                # Quota errors say nothing about the title itself
+                self.logger.error(f"{self.base_url} refused: {error}")
+                self.scheduler.mark_exhausted()
+                raise QuotaExhausted(error)
+            if status == 200 and data is not None:
+                return data
+            # Back off outside the request slot so other lookups can go ahead
+            await asyncio.sleep(1)
+        return None
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+
+class LocalProvider(MetadataProvider):
+    """OMDB records kept in SQLite, e.g. imported from an offline dump.
+
+    Lives in ``movies info/local_metadata.db``. Answers come straight from
+    disk without any network access, so a library covered by the dump can
+    be organized offline.
+    """
+
+    name = "local"
+
+    def __init__(self, db_path: Path, scheduler: Optional[FetchScheduler] = None):
+        super().__init__(scheduler)
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def import_records(self, records: Iterable[Dict]) -> int:
+        """Store OMDB records, replacing older copies of the same IDs"""
+        rows = [
+            (
+                record["imdbID"],
+                normalize_title(record["Title"]),
+                str(record.get("Year") or "")[:4],
+                json.dumps(record, ensure_ascii=False),
+            )
+            for record in records
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO records (imdb_id, title, year, data) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def answer(self, params: Dict) -> Dict:
+        """Answer one query from the stored records"""
+        if params.get("i"):
+            sql, args = "SELECT data FROM records WHERE imdb_id = ?", (params["i"],)
+        elif params.get("t"):
+            year = str(params.get("y") or "")
+            sql = (
+                "SELECT data FROM records WHERE title = ? AND (? = '' OR year = ?) "
+                "ORDER BY year DESC LIMIT 1"
+            )
+            args = (normalize_title(params["t"]), year, year)
+        elif params.get("s"):
+            sql = "SELECT data FROM records WHERE title LIKE ? LIMIT 10"
+            args = (f"%{normalize_title(params['s'])}%",)
+        else:
+            return dict(NOT_FOUND)
+        with self._lock:
+            records = [json.loads(row[0]) for row in self._conn.execute(sql, args)]
+        if not records:
+            return dict(NOT_FOUND)
+        if params.get("s"):
+            fields = ("Title", "Year", "imdbID", "Type")
+            return {
+                "Search": [{key: r.get(key) for key in fields} for r in records],
+                "Response": "True",
+            }
+        return records[0]
+
+    async def query(self, params: Dict) -> Optional[Dict]:
+        async with self.scheduler.request_slot():
+            return self.answer(params)
+
+
+class ProviderChain:
+    """Ask providers in order until one knows the answer.
+
+    A provider that has nothing, can't be reached or is out of quota hands
+    the query to the next. If nobody found anything but a provider was out
+    of quota, QuotaExhausted is raised so the movie is deferred rather
+    than given up on; if one failed, the lookup counts as failed.
+    """
+
+    def __init__(self, providers: List[MetadataProvider]):
+        self.providers = providers
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def requests_made(self) -> int:
+        return sum(p.scheduler.requests_made for p in self.providers)
+
+    async def query(self, params: Dict) -> Optional[Dict]:
+        answer = None
+        failed = exhausted = False
+        for provider in self.providers:
+            try:
+                result = await provider.query(params)
+            except QuotaExhausted:
+                exhausted = True
+                continue
+            if found(result):
+                return result
+            if result is None:
+                failed = True
+            else:
+                answer = answer or result
+        if exhausted:
+            raise QuotaExhausted("Every metadata provider is out of quota")
+        if failed:
+            return None
+        return answer
+
+    async def close(self):
+        for provider in self.providers:
+            try:
+                await provider.close()
+            except Exception as e:
+                self.logger.error(f"Error closing {provider.name} provider: {e}")
@@ -0,0 +1,172 @@
+# metadata_store.py
+import json
+import time
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS movies (
+    folder TEXT PRIMARY KEY,
+    imdb_id TEXT,
+    data TEXT NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS movies_imdb_id ON movies (imdb_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# SQLite's default limit on bound parameters per statement
+_CHUNK = 900
+
+
+class MetadataStore:
+    """Consolidated OMDB metadata for a library, one row per movie folder.
+
+    Lives in ``movies info/metadata.db`` and replaces the per-movie
+    ``<folder>_about.json`` files, which are imported once on first open.
+    """
+
+    _stores: Dict[Path, "MetadataStore"] = {}
+    _stores_lock = threading.Lock()
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    @classmethod
+    def for_library(cls, root: Path) -> "MetadataStore":
+        """Shared store for a library root, migrating old JSON files once"""
+        movies_info_dir = Path(root) / "movies info"
+        db_path = movies_info_dir / "metadata.db"
+        with cls._stores_lock:
+            store = cls._stores.get(db_path)
+            if store is None:
+                movies_info_dir.mkdir(exist_ok=True)
+                store = cls(db_path)
+                store.migrate_json(movies_info_dir)
+                cls._stores[db_path] = store
+        return store
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def get(self, folder: str) -> Optional[Dict]:
+        """Return the saved data for one movie folder"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM movies WHERE folder = ?", (folder,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_many(self, folders: Iterable[str]) -> Dict[str, Dict]:
+        """Return saved data for many folders in as few queries as possible"""
+        folders = list(folders)
+        results = {}
+        with self._lock:
+            for i in range(0, len(folders), _CHUNK):
+                chunk = folders[i : i + _CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                for folder, data in self._conn.execute(
+                    f"SELECT folder, data FROM movies WHERE folder IN ({placeholders})",
+                    chunk,
+                ):
+                    results[folder] = json.loads(data)
+        return results
+
+    def all(self) -> Dict[str, Dict]:
+        """Return every stored movie"""
+        with self._lock:
+            rows = self._conn.execute("SELECT folder, data FROM movies").fetchall()
+        return {folder: json.loads(data) for folder, data in rows}
+
+    def put(self, folder: str, data: Dict):
+        self.put_many([(folder, data)])
+
+    def put_many(self, items: List[Tuple[str, Dict]]):
+        """Write several movies in a single transaction"""
+        now = time.time()
+        rows = [
+            (folder, data.get("imdbID"), json.dumps(data, ensure_ascii=False), now)
+            for folder, data in items
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO movies (folder, imdb_id, data, updated) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def delete(self, folder: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM movies WHERE folder = ?", (folder,))
+
+    def _meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM meta WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def migrate_json(self, movies_info_dir: Path) -> int:
+        """Import existing ``*_about.json`` files; runs only once per store"""
+        if self._meta("json_migrated"):
+            return 0
+        items = []
+        for info_path in Path(movies_info_dir).glob("*_about.json"):
+            try:
+                with open(info_path, encoding="utf-8") as f:
+                    items.append((info_path.name[: -len("_about.json")], json.load(f)))
+            except Exception as e:
+                self.logger.error(f"Error migrating {info_path}: {e}")
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO movies (folder, imdb_id, data, updated) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        folder,
+                        data.get("imdbID"),
+                        json.dumps(data, ensure_ascii=False),
+                        time.time(),
+                    )
+                    for folder, data in items
+                ],
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('json_migrated', '1')"
+            )
+        if items:
+            self.logger.info(
+                f"Migrated {len(items)} movie info files to {self.db_path}"
+            )
+        return len(items)
+
+
+def load_movie_data(movie_path) -> Optional[Dict]:
+    """Read the saved OMDB data for a movie folder, or None if there is none"""
+    movie_path = Path(movie_path)
+    root_dir = movie_path.parent.parent
+    return MetadataStore.for_library(root_dir).get(movie_path.name)
+
+
+def poster_source(movie_data: Optional[Dict]) -> Optional[str]:
+    """Local poster path if it exists, else the online poster URL, else None"""
+    if not movie_data:
+        return None
+    source = movie_data.get("LocalPoster")
+    if not source or not Path(source).exists():
+        source = movie_data.get("Poster")
+    return source if source and source != "N/A" else None
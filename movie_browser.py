@@ -4,42 +4,75 @@ from PySide6.QtWidgets import (
     QHBoxLayout,
     QLabel,
     QPushButton,
-    QScrollArea,
     QFrame,
     QComboBox,
     QSpacerItem,
     QSizePolicy,
-    QGridLayout,
+    QSpinBox,
+    QDoubleSpinBox,
+    QLineEdit,
 )
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import QTimer
+import multiprocessing
 from pathlib import Path
-from movie_tile import MovieTile
+from movie_grid import MovieGridView, MovieListModel
+from release_parser import ParseCache, quality_level
+from duplicate_index import DuplicateIndex
+from library_loader import LibraryLoader
+from library_watcher import LibraryWatcher
+from metadata_store import MetadataStore
+from movie_organizer_core import GENRES
+from sort_filter import SortFilterEngine, MovieFilter, SORT_OPTIONS
+from search_index import SearchIndex, MIN_QUERY_LENGTH
+
+
+class MovieBrowser(QWidget):
+    COMBO_STYLE = """
+        QComboBox {
+            padding: 5px;
+            border: 1px solid #ccc;
+            border-radius: 3px;
+            min-width: 100px;
+        }
+    """
+
+    REFRESH_INTERVAL_MS = 200
 
-
-class MovieBrowser(QScrollArea):
     def __init__(self, mainwindow=None):
         super().__init__()
         self.mainwindow = mainwindow
-        self.setup_ui()
         self.movies = []
-        self.tiles_to_load = []
-        self.current_load_index = 0
-        self.load_timer = QTimer(self)
-        self.load_timer.timeout.connect(self.load_next_batch)
+        self.parser = ParseCache()
+        self.duplicates = []
+        self.engine = SortFilterEngine()
+        self.search_index = SearchIndex()
+        self.directory = None
+        self.dedup = None
+        # Every movie folder loaded, including hidden duplicates
+        self.records = {}
+        self.loader = None
+        self.load_generation = 0
+        # Manifest read by the last load, reused for folder changes
+        self.manifest = None
+        # Folders added on disk, loaded off the GUI thread one batch at a time
+        self.change_loader = None
+        self.pending_folders = []
+        # IMDb IDs of folders removed from one genre, kept for their re-adding
+        self.moved_ids = {}
+        # Batches from the loader are shown at most this often
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(self.REFRESH_INTERVAL_MS)
+        self.refresh_timer.timeout.connect(self.update_loaded_movies)
+        self.watcher = LibraryWatcher(GENRES, self)
+        self.watcher.folders_changed.connect(self.apply_folder_changes)
+        self.setup_ui()
 
     def setup_ui(self):
-        # Make the scroll area look clean
-        self.setWidgetResizable(True)
-        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        self.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        self.setStyleSheet("QScrollArea { border: none; background-color: #f5f5f5; }")
-
-        # Create main container widget
-        container = QWidget()
-        self.setWidget(container)
+        self.setStyleSheet("MovieBrowser { background-color: #f5f5f5; }")
 
         # Main layout
-        main_layout = QVBoxLayout(container)
+        main_layout = QVBoxLayout(self)
         main_layout.setSpacing(20)
         main_layout.setContentsMargins(20, 20, 20, 20)
 
@@ -54,19 +87,27 @@ class MovieBrowser(QScrollArea):
         # Spacer
         header_layout.addStretch()
 
-        # Sort dropdown
-        self.sort_combo = QComboBox()
-        self.sort_combo.addItems(["Name", "Genre", "Year"])
-        self.sort_combo.setStyleSheet(
+        # Search box; results update on every keystroke
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Search titles, actors, directors...")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.setStyleSheet(
             """
-            QComboBox {
+            QLineEdit {
                 padding: 5px;
                 border: 1px solid #ccc;
                 border-radius: 3px;
-                min-width: 100px;
+                min-width: 250px;
             }
         """
         )
+        self.search_edit.textChanged.connect(self.apply_view)
+        header_layout.addWidget(self.search_edit)
+
+        # Sort dropdown
+        self.sort_combo = QComboBox()
+        self.sort_combo.addItems(list(SORT_OPTIONS))
+        self.sort_combo.setStyleSheet(self.COMBO_STYLE)
         self.sort_combo.currentTextChanged.connect(self.sort_movies)
         header_layout.addWidget(QLabel("Sort by:"))
         header_layout.addWidget(self.sort_combo)
@@ -92,171 +133,280 @@ class MovieBrowser(QScrollArea):
 
         main_layout.addLayout(header_layout)
 
-        # Grid for movie tiles
-        self.grid_layout = QGridLayout()
-        self.grid_layout.setSpacing(20)
-        main_layout.addLayout(self.grid_layout)
-
-        # Add stretch at the bottom
-        main_layout.addStretch()
-
-    def is_duplicate_movie(self, movie_path, existing_movies):
-        """
-        Check if a movie is a duplicate based on name and quality
-        Returns True if it's a duplicate, False otherwise
-        """
-        movie_name = movie_path.name.lower()
-
-        # Remove quality indicators from name for comparison
-        quality_indicators = ["2160p", "1080p", "720p", "480p", "576p"]
-        base_name = movie_name
-        for quality in quality_indicators:
-            base_name = base_name.replace(quality, "").strip()
-
-        # Check against existing movies
-        for existing_movie in existing_movies:
-            existing_name = existing_movie.name.lower()
-            # Remove quality from existing name
-            existing_base = existing_name
-            for quality in quality_indicators:
-                existing_base = existing_base.replace(quality, "").strip()
-
-            if base_name == existing_base:
-                # If it's the same movie, keep the higher quality version
-                current_quality = self.get_quality_level(movie_path.name)
-                existing_quality = self.get_quality_level(existing_movie.name)
-
-                if current_quality > existing_quality:
-                    # Remove the lower quality version
-                    existing_movies.remove(existing_movie)
-                    return False
-                return True
-
-        return False
+        # Filter section
+        filter_layout = QHBoxLayout()
+
+        self.genre_combo = QComboBox()
+        self.genre_combo.addItem("All genres")
+        self.genre_combo.setStyleSheet(self.COMBO_STYLE)
+        self.genre_combo.currentTextChanged.connect(self.apply_view)
+        filter_layout.addWidget(QLabel("Genre:"))
+        filter_layout.addWidget(self.genre_combo)
+
+        self.quality_combo = QComboBox()
+        self.quality_combo.addItems(["Any", "2160p", "1080p", "720p", "576p", "480p"])
+        self.quality_combo.setStyleSheet(self.COMBO_STYLE)
+        self.quality_combo.currentTextChanged.connect(self.apply_view)
+        filter_layout.addWidget(QLabel("Quality:"))
+        filter_layout.addWidget(self.quality_combo)
+
+        self.rating_spin = QDoubleSpinBox()
+        self.rating_spin.setRange(0, 10)
+        self.rating_spin.setSingleStep(0.5)
+        self.rating_spin.setSpecialValueText("Any")
+        self.rating_spin.valueChanged.connect(self.apply_view)
+        filter_layout.addWidget(QLabel("Min rating:"))
+        filter_layout.addWidget(self.rating_spin)
+
+        self.year_from_spin = QSpinBox()
+        self.year_to_spin = QSpinBox()
+        for spin in (self.year_from_spin, self.year_to_spin):
+            spin.setRange(1899, 2100)
+            spin.setSpecialValueText("Any")
+            spin.setValue(1899)
+            spin.valueChanged.connect(self.apply_view)
+        filter_layout.addWidget(QLabel("Year:"))
+        filter_layout.addWidget(self.year_from_spin)
+        filter_layout.addWidget(QLabel("to"))
+        filter_layout.addWidget(self.year_to_spin)
+
+        filter_layout.addStretch()
+        main_layout.addLayout(filter_layout)
+
+        # Virtualized grid for movie tiles; only visible tiles are painted
+        self.movie_model = MovieListModel(self)
+        self.grid_view = MovieGridView()
+        self.grid_view.setModel(self.movie_model)
+        self.grid_view.movie_activated.connect(self.show_movie_details)
+        main_layout.addWidget(self.grid_view)
 
     def get_quality_level(self, filename):
         """Get numerical quality level for comparison"""
-        if "2160p" in filename:
-            return 4
-        elif "1080p" in filename:
-            return 3
-        elif "720p" in filename:
-            return 2
-        elif "576p" in filename:
-            return 1
-        elif "480p" in filename:
-            return 0
-        return -1  # No quality specified
+        return quality_level(self.parser.parse(filename))
 
     def load_movies(self, directory):
-        """Load movies from the specified directory"""
+        """Load movies from the specified directory.
+
+        The library is walked on a LibraryLoader thread; movies appear in the
+        grid genre by genre while the walk is still running. Once loaded, the
+        library watcher keeps the grid up to date.
+        """
         print(f"Loading movies from directory: {directory}")
+        self.watcher.stop()
         self.clear_movies()
 
-        directory_path = Path(directory)
-        unique_movies = []
-
-        # Load movies from each folder
-        for folder in directory_path.iterdir():
-            if folder.is_dir() and folder.name not in [
-                "movies info",
-                "Manual Checking",
-            ]:
-                print(f"Scanning folder: {folder.name}")
-
-                # Scan this folder for movie folders
-                for movie_folder in folder.iterdir():
-                    if movie_folder.is_dir():
-                        if not self.is_duplicate_movie(movie_folder, unique_movies):
-                            print(f"Found movie: {movie_folder.name}")
-                            unique_movies.append(movie_folder)
-                        else:
-                            print(f"Skipping duplicate: {movie_folder.name}")
-
-        self.movies = unique_movies
+        self.directory = Path(directory)
+        # The loader thread may fan out to processes; forking Qt isn't safe
+        self.parser = ParseCache(
+            self.directory / "movies info" / "parse_cache.json",
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+        # Keep the best quality copy of each movie, keyed on IMDb ID when the
+        # organizer recorded one
+        self.dedup = DuplicateIndex(lambda path: self.get_quality_level(path.name))
+        self.duplicates = []
+
+        if self.loader is not None:
+            self.loader.requestInterruption()
+        if self.change_loader is not None:
+            self.change_loader.requestInterruption()
+        self.manifest = None
+        self.pending_folders = []
+        self.moved_ids = {}
+        self.load_generation += 1
+        self.loader = LibraryLoader(
+            self.directory, self.load_generation, self.parser, self.search_index, self
+        )
+        self.loader.batch_ready.connect(self.add_loaded_batch)
+        self.loader.finished_loading.connect(self.loading_finished)
+        self.loader.finished.connect(self.loader.deleteLater)
+        self.loader.start()
+
+    def add_loaded_batch(self, generation, batch):
+        """Merge one genre folder's movies into the view"""
+        if generation != self.load_generation:
+            return
+        self.merge_folders(batch)
+        if not self.refresh_timer.isActive():
+            self.refresh_timer.start()
+
+    def merge_folders(self, batch):
+        """Add (path, imdb_id, record) entries, hiding lower quality copies"""
+        for path, imdb_id, record in batch:
+            self.records[path] = record
+            seen = len(self.dedup.duplicates)
+            self.dedup.add(path, imdb_id)
+            if len(self.dedup.duplicates) > seen:
+                self.search_index.remove(self.dedup.duplicates[-1].discarded)
+
+    def loading_finished(self, generation):
+        """Show the complete library once the walk is done"""
+        if generation != self.load_generation:
+            return
+        self.manifest = self.loader.manifest
+        self.loader = None
+        self.refresh_timer.stop()
+        self.update_loaded_movies()
         print(f"Total unique movies found: {len(self.movies)}")
+        for duplicate in self.duplicates:
+            print(f"Skipping duplicate: {duplicate['discarded']}")
 
-        # Update title with movie count
-        self.title_label.setText(f"My Movies ({len(self.movies)})")
+        # Forget movies that are no longer in the library
+        self.search_index.retain(self.movies)
+        self.watcher.watch(self.directory, self.records)
 
-        # Sort movies initially by name
-        self.sort_movies("Name")
+    def apply_folder_changes(self, added, removed):
+        """Apply movie folders added, removed or moved on disk since the load.
 
-        # Start loading movies in batches
-        self.current_load_index = 0
-        self.display_movies()
+        Removals are applied right away; added folders are parsed and looked
+        up on a LibraryLoader thread and show up once it is done.
+        """
+        if self.dedup is None or self.loader is not None:
+            return
+        print(f"Library changed: {len(added)} added, {len(removed)} removed")
+        store = MetadataStore.for_library(self.directory)
+
+        # A folder moved between genres keeps the IMDb ID recorded for it
+        for path in removed:
+            entry = self.manifest.get(path) if self.manifest else None
+            if entry and entry.imdb_id:
+                self.moved_ids[path.name] = entry.imdb_id
+            self.records.pop(path, None)
+            self.search_index.remove(path)
+            promoted = self.dedup.remove(path)
+            if promoted is not None:
+                self.search_index.add(
+                    promoted, store.get(promoted.name), promoted.name
+                )
+
+        gone = set(removed)
+        self.pending_folders = [p for p in self.pending_folders if p not in gone]
+        self.pending_folders.extend(added)
+        self.load_changed_folders()
+        if removed:
+            self.update_loaded_movies()
+
+    def load_changed_folders(self):
+        """Start loading the added folders, unless a batch is already loading"""
+        if self.change_loader is not None or not self.pending_folders:
+            return
+        folders, self.pending_folders = self.pending_folders, []
+        self.change_loader = LibraryLoader(
+            self.directory,
+            self.load_generation,
+            self.parser,
+            self.search_index,
+            self,
+            folders=folders,
+            manifest=self.manifest,
+        )
+        self.change_loader.batch_ready.connect(self.add_changed_batch)
+        self.change_loader.finished_loading.connect(self.changed_folders_loaded)
+        self.change_loader.finished.connect(self.change_loader.deleteLater)
+        self.change_loader.start()
+
+    def add_changed_batch(self, generation, batch):
+        """Merge folders added on disk, skipping any removed again meanwhile"""
+        if generation != self.load_generation:
+            return
+        snapshot = self.watcher.snapshot
+        self.merge_folders(
+            (path, imdb_id or self.moved_ids.pop(path.name, None), record)
+            for path, imdb_id, record in batch
+            if path in snapshot.get(path.parent, ())
+        )
+        self.update_loaded_movies()
+
+    def changed_folders_loaded(self, generation):
+        """Load whatever was added while the last batch was loading"""
+        loader, self.change_loader = self.change_loader, None
+        if generation != self.load_generation:
+            return
+        if self.manifest is None:
+            self.manifest = loader.manifest
+        self.load_changed_folders()
+
+    def update_loaded_movies(self):
+        """Push the movies loaded so far into the engine and the grid"""
+        self.movies = self.dedup.movies()
+        self.engine.set_records(self.records[path] for path in self.movies)
+        self.duplicates = self.dedup.report()
+        self.title_label.setToolTip(
+            f"{len(self.duplicates)} lower quality duplicates hidden"
+            if self.duplicates
+            else ""
+        )
+
+        genre = self.genre_combo.currentText()
+        self.genre_combo.blockSignals(True)
+        self.genre_combo.clear()
+        self.genre_combo.addItem("All genres")
+        self.genre_combo.addItems(self.engine.genres())
+        self.genre_combo.setCurrentText(genre)
+        self.genre_combo.blockSignals(False)
+
+        self.apply_view()
 
     def clear_movies(self):
         """Clear all movies from the grid"""
         print("Clearing existing movies")
-        while self.grid_layout.count():
-            item = self.grid_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
         self.movies.clear()
-        self.load_timer.stop()
-
-    def load_next_batch(self):
-        """Load next batch of movies"""
-        BATCH_SIZE = 10
-        end_index = min(self.current_load_index + BATCH_SIZE, len(self.tiles_to_load))
-
-        for i in range(self.current_load_index, end_index):
-            movie_path, row, col = self.tiles_to_load[i]
-            movie_tile = MovieTile(str(movie_path))
-            self.grid_layout.addWidget(movie_tile, row, col)
-
-        self.current_load_index = end_index
-        if self.current_load_index >= len(self.tiles_to_load):
-            self.load_timer.stop()
+        self.records = {}
+        self.engine.set_records([])
+        self.movie_model.set_movies([])
 
     def display_movies(self):
         """Display movies in the grid"""
         print(f"Displaying {len(self.movies)} movies")
+        self.apply_view()
 
-        # Calculate number of columns based on window width
-        columns = max(1, self.width() // 250)  # 250px per tile including spacing
-        print(f"Grid columns: {columns}")
+    def show_movie_details(self, movie_path):
+        """Open the details dialog for a movie"""
+        from movie_details_dialog import MovieDetailsDialog
 
-        # Prepare tiles to load
-        self.tiles_to_load = []
-        for i, movie_path in enumerate(self.movies):
-            print(f"Creating tile for movie {i+1}: {movie_path.name}")
-            row = i // columns
-            col = i % columns
-            self.tiles_to_load.append((movie_path, row, col))
-
-        # Start loading timer
-        self.current_load_index = 0
-        self.load_timer.start(50)  # Load batch every 50ms
+        dialog = MovieDetailsDialog(str(movie_path), self.window())
+        dialog.exec()
 
     def sort_movies(self, criteria):
         """Sort movies based on selected criteria"""
         print(f"Sorting by: {criteria}")
-        if criteria == "Name":
-            self.movies.sort(key=lambda x: x.name.lower())
-        elif criteria == "Genre":
-            self.movies.sort(key=lambda x: x.parent.name.lower())
-        elif criteria == "Year":
-
-            def get_year(path):
-                name = path.name
-                import re
-
-                year_match = re.search(r"\((\d{4})\)", name)
-                return year_match.group(1) if year_match else name.lower()
-
-            self.movies.sort(key=get_year)
+        self.apply_view()
+
+    def current_filter(self):
+        """Build a MovieFilter from the filter controls"""
+        genre = self.genre_combo.currentText()
+        quality = self.quality_combo.currentText()
+        year_from = self.year_from_spin.value()
+        year_to = self.year_to_spin.value()
+        rating = self.rating_spin.value()
+        return MovieFilter(
+            genre=genre if genre != "All genres" else None,
+            year_min=year_from if year_from != self.year_from_spin.minimum() else None,
+            year_max=year_to if year_to != self.year_to_spin.minimum() else None,
+            min_rating=rating if rating > 0 else None,
+            quality=self.get_quality_level(quality) if quality != "Any" else None,
+        )
 
-        self.display_movies()
+    def apply_view(self, *args):
+        """Apply the current sort and filters by reordering the grid model"""
+        sort_keys = SORT_OPTIONS.get(
+            self.sort_combo.currentText(), SORT_OPTIONS["Name"]
+        )
+        visible = self.engine.apply(sort_keys, self.current_filter())
+        query = self.search_edit.text().strip()
+        # The first keystroke alone would hide nearly everything; wait for more
+        if len(query) >= MIN_QUERY_LENGTH:
+            matches = set(self.search_index.search(query))
+            visible = [path for path in visible if path in matches]
+        self.title_label.setText(
+            f"My Movies ({len(visible)})"
+            if len(visible) == len(self.movies)
+            else f"My Movies ({len(visible)} of {len(self.movies)})"
+        )
+        self.movie_model.set_movies(visible)
 
     def refresh_movies(self):
         """Refresh the movie list"""
         if self.mainwindow and self.mainwindow.current_directory:
             self.load_movies(self.mainwindow.current_directory)
-
-    def resizeEvent(self, event):
-        """Handle resize events to adjust the grid layout"""
-        super().resizeEvent(event)
-        if self.movies:  # Only redisplay if there are movies
-            self.display_movies()
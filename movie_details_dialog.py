@@ -13,17 +13,18 @@ from PySide6.QtCore import Qt
 from PySide6.QtGui import QPixmap
 import os
 import subprocess
-import json
-import aiohttp
-import asyncio
 from pathlib import Path
 import webbrowser
+from thumbnail_store import DIALOG_SIZE
+from poster_service import PosterService
+from metadata_store import load_movie_data, poster_source
 
 
 class MovieDetailsDialog(QDialog):
     def __init__(self, movie_path, parent=None):
         super().__init__(parent)
         self.movie_path = Path(movie_path)
+        self.poster_key = None
         print(f"Movie path: {self.movie_path}")  # Debug print
         self.setWindowTitle(self.movie_path.name)
         self.setMinimumSize(800, 600)
@@ -146,21 +147,17 @@ class MovieDetailsDialog(QDialog):
 
     def load_movie_info(self):
         try:
-            # Get the root movies directory (two levels up from movie folder)
-            root_dir = self.movie_path.parent.parent
-            info_path = root_dir / "movies info" / f"{self.movie_path.name}_about.json"
-            print(f"Looking for info file at: {info_path}")  # Debug print
-
-            if info_path.exists():
-                print("Info file found!")  # Debug print
-                with open(info_path, encoding="utf-8") as f:
-                    movie_data = json.load(f)
-                    print(f"Loaded movie data: {movie_data}")  # Debug print
-                    self.update_ui_with_movie_data(movie_data)
+            # Movie data lives in the library's metadata store
+            movie_data = load_movie_data(self.movie_path)
+            if movie_data:
+                print(f"Loaded movie data: {movie_data}")  # Debug print
+                self.update_ui_with_movie_data(movie_data)
             else:
-                print(f"Movie info file not found at {info_path}")
+                print(f"Movie info not found for {self.movie_path.name}")
                 QMessageBox.warning(
-                    self, "Warning", f"Movie information file not found at {info_path}"
+                    self,
+                    "Warning",
+                    f"Movie information not found for {self.movie_path.name}",
                 )
         except Exception as e:
             print(f"Error in load_movie_info: {str(e)}")  # Debug print
@@ -204,45 +201,45 @@ class MovieDetailsDialog(QDialog):
             print(f"Setting cast: {cast_text}")  # Debug print
             self.cast_label.setText(cast_text)
 
-            # Load poster
-            poster_url = movie_data.get("Poster")
-            print(f"Poster URL: {poster_url}")  # Debug print
-            if poster_url and poster_url != "N/A":
-                asyncio.run(self.load_poster(poster_url))
+            # Show a placeholder at once; the poster (local if saved, else
+            # the online one) loads in the background and replaces it
+            placeholder = QPixmap(*DIALOG_SIZE)
+            placeholder.fill(Qt.gray)
+            self.poster_label.setPixmap(placeholder)
+            source = poster_source(movie_data)
+            print(f"Poster source: {source}")  # Debug print
+            if source:
+                service = PosterService.instance()
+                service.poster_ready.connect(self.poster_ready)
+                self.poster_key = service.request(id(self), source, DIALOG_SIZE)
             else:
-                print("No valid poster URL found")  # Debug print
-                placeholder = QPixmap(300, 450)
-                placeholder.fill(Qt.gray)
-                self.poster_label.setPixmap(placeholder)
+                print("No valid poster found")  # Debug print
         except Exception as e:
             print(f"Error in update_ui_with_movie_data: {str(e)}")  # Debug print
             QMessageBox.warning(
                 self, "Warning", f"Error updating UI with movie data: {str(e)}"
             )
 
-    async def load_poster(self, url):
+    def poster_ready(self, key, image):
+        if key != self.poster_key:
+            return
+        self.poster_key = None
+        if image.isNull():
+            print("Failed to load poster")  # Debug print
+        else:
+            self.poster_label.setPixmap(QPixmap.fromImage(image))
+
+    def done(self, result):
+        # Stop waiting for the poster once the dialog closes
+        service = PosterService.instance()
+        if self.poster_key:
+            service.cancel(id(self), self.poster_key)
+            self.poster_key = None
         try:
-            print(f"Attempting to load poster from: {url}")  # Debug print
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    print(f"Poster response status: {response.status}")  # Debug print
-                    if response.status == 200:
-                        data = await response.read()
-                        pixmap = QPixmap()
-                        success = pixmap.loadFromData(data)
-                        print(f"Pixmap load success: {success}")  # Debug print
-                        if success:
-                            scaled_pixmap = pixmap.scaled(
-                                300, 450, Qt.KeepAspectRatio, Qt.SmoothTransformation
-                            )
-                            self.poster_label.setPixmap(scaled_pixmap)
-                        else:
-                            print("Failed to create pixmap from data")
-        except Exception as e:
-            print(f"Error loading poster: {str(e)}")  # Debug print
-            placeholder = QPixmap(300, 450)
-            placeholder.fill(Qt.gray)
-            self.poster_label.setPixmap(placeholder)
+            service.poster_ready.disconnect(self.poster_ready)
+        except (RuntimeError, TypeError):
+            pass
+        super().done(result)
 
     def watch_trailer(self):
         try:
@@ -0,0 +1,337 @@
+# movie_grid.py
+from PySide6.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView
+from PySide6.QtCore import (
+    Qt,
+    QAbstractListModel,
+    QModelIndex,
+    QRect,
+    QSize,
+    QTimer,
+    Signal,
+)
+from PySide6.QtGui import QPixmap, QColor, QPen, QPainter
+from collections import OrderedDict
+from metadata_store import MetadataStore, poster_source
+from poster_service import PosterService
+from thumbnail_store import TILE_SIZE
+
+TILE_WIDTH, TILE_HEIGHT = 200, 300
+POSTER_WIDTH, POSTER_HEIGHT = 180, 240
+TILE_SPACING = 10  # Half of the gap between two tiles
+CELL_WIDTH = TILE_WIDTH + 2 * TILE_SPACING
+CELL_HEIGHT = TILE_HEIGHT + 2 * TILE_SPACING
+
+PathRole = Qt.UserRole + 1
+PosterRole = Qt.UserRole + 2
+
+
+class MovieListModel(QAbstractListModel):
+    """List model over movie folders that loads posters only when asked.
+
+    Posters live in a bounded LRU, so memory depends on how many tiles were
+    on screen recently rather than on the size of the library.
+    """
+
+    BATCH_SIZE = 10
+    # Above this many inserted/removed rows a model reset is cheaper
+    MAX_ROW_CHANGES = 100
+
+    def __init__(self, parent=None, cache_size=300):
+        super().__init__(parent)
+        self.movies = []
+        self.rows = {}
+        self.cache_size = cache_size
+        self.posters = OrderedDict()
+        self.pending = OrderedDict()
+        self.sources = {}
+        self.requests = {}
+        self.paths_by_key = {}
+        self.poster_service = PosterService.instance()
+        self.poster_service.poster_ready.connect(self.poster_ready)
+        self.load_timer = QTimer(self)
+        self.load_timer.timeout.connect(self.load_next_batch)
+
+    def set_movies(self, movies):
+        """Replace the list of movie folders shown by the view"""
+        movies = list(movies)
+        if len(movies) == len(self.movies) and set(movies) == set(self.rows):
+            # Same movies in a new order: keep the view and loaded posters
+            self.layoutAboutToBeChanged.emit()
+            self.movies = movies
+            self.rows = {path: row for row, path in enumerate(self.movies)}
+            self.layoutChanged.emit()
+            return
+        if self.movies and self.apply_row_changes(movies):
+            return
+
+        self.beginResetModel()
+        self.movies = movies
+        self.rows = {path: row for row, path in enumerate(self.movies)}
+        self.load_sources()
+        self.pending.clear()
+        self.cancel_requests(lambda path: path not in self.rows)
+        self.endResetModel()
+
+    def apply_row_changes(self, movies):
+        """Insert and remove individual rows when only a few movies changed.
+
+        Returns False, changing nothing, if too many rows changed or the
+        remaining movies were reordered; the caller then resets the model.
+        """
+        new_paths = set(movies)
+        removed = [row for row, path in enumerate(self.movies) if path not in new_paths]
+        inserted = [row for row, path in enumerate(movies) if path not in self.rows]
+        if len(removed) + len(inserted) > self.MAX_ROW_CHANGES:
+            return False
+        if [p for p in self.movies if p in new_paths] != [
+            p for p in movies if p in self.rows
+        ]:
+            return False
+
+        for row in reversed(removed):
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.movies[row]
+            self.endRemoveRows()
+        for row in inserted:
+            self.beginInsertRows(QModelIndex(), row, row)
+            self.movies.insert(row, movies[row])
+            self.endInsertRows()
+
+        self.rows = {path: row for row, path in enumerate(self.movies)}
+        self.load_sources()
+        for path in [p for p in self.pending if p not in self.rows]:
+            del self.pending[path]
+        self.cancel_requests(lambda path: path not in self.rows)
+        return True
+
+    def load_sources(self):
+        """Look up poster sources for every movie with one query per library"""
+        by_root = {}
+        for path in self.movies:
+            if path not in self.sources:
+                by_root.setdefault(path.parent.parent, []).append(path)
+        for root, paths in by_root.items():
+            try:
+                found = MetadataStore.for_library(root).get_many(p.name for p in paths)
+            except Exception as e:
+                print(f"Error loading movie info from {root}: {e}")
+                found = {}
+            for path in paths:
+                self.sources[path] = poster_source(found.get(path.name))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.movies)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.movies):
+            return None
+        path = self.movies[index.row()]
+        if role == Qt.DisplayRole:
+            return path.name
+        if role == PathRole:
+            return path
+        if role == PosterRole:
+            pixmap = self.posters.get(path)
+            if pixmap is None:
+                self.request_poster(path)
+            else:
+                self.posters.move_to_end(path)
+            return pixmap
+        return None
+
+    def request_poster(self, path):
+        """Queue a poster load; the most recent requests are served first"""
+        if path in self.posters or path in self.requests:
+            return
+        self.pending[path] = None
+        self.pending.move_to_end(path)
+        while len(self.pending) > self.cache_size:
+            self.pending.popitem(last=False)
+        if not self.load_timer.isActive():
+            self.load_timer.start(20)
+
+    def prefetch(self, first, last):
+        """Request posters for rows ``first`` to ``last`` and drop the rest"""
+        wanted = set(self.movies[max(0, first) : max(0, last + 1)])
+        for path in list(self.pending):
+            if path not in wanted:
+                del self.pending[path]
+        self.cancel_requests(lambda path: path not in wanted)
+        for row in range(max(0, first), min(len(self.movies), last + 1)):
+            self.request_poster(self.movies[row])
+
+    def cancel_requests(self, predicate):
+        """Cancel in-flight poster loads for rows that left the viewport"""
+        for path in [p for p in self.requests if predicate(p)]:
+            key = self.requests.pop(path)
+            paths = self.paths_by_key.get(key)
+            if paths is not None:
+                paths.discard(path)
+                if not paths:
+                    del self.paths_by_key[key]
+            self.poster_service.cancel(path, key)
+
+    def load_next_batch(self):
+        """Load the next batch of requested posters"""
+        for _ in range(min(self.BATCH_SIZE, len(self.pending))):
+            path, _ = self.pending.popitem(last=True)
+            self.load_poster(path)
+        if not self.pending:
+            self.load_timer.stop()
+
+    def load_poster(self, path):
+        source = self.sources.get(path)
+        if source:
+            key = self.poster_service.request(path, source, TILE_SIZE)
+            self.requests[path] = key
+            self.paths_by_key.setdefault(key, set()).add(path)
+            return
+
+        # Remember that there is nothing to show so we don't ask again
+        self.store_poster(path, QPixmap())
+
+    def poster_ready(self, key, image):
+        """A poster was decoded off the GUI thread"""
+        for path in self.paths_by_key.pop(key, ()):
+            self.requests.pop(path, None)
+            self.store_poster(
+                path, QPixmap.fromImage(image) if not image.isNull() else QPixmap()
+            )
+
+    def store_poster(self, path, pixmap):
+        """Cache a loaded poster and repaint its tile"""
+        self.posters[path] = pixmap
+        self.posters.move_to_end(path)
+        while len(self.posters) > self.cache_size:
+            self.posters.popitem(last=False)
+        row = self.rows.get(path)
+        if row is not None:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [PosterRole])
+
+
+class MovieTileDelegate(QStyledItemDelegate):
+    """Paints a movie tile (poster and title) for the grid view"""
+
+    def sizeHint(self, option, index):
+        return QSize(TILE_WIDTH, TILE_HEIGHT)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        rect = option.rect.adjusted(1, 1, -1, -1)
+        if option.state & QStyle.State_MouseOver:
+            painter.setPen(QPen(QColor("#4CAF50"), 2))
+            painter.setBrush(QColor("#f0f0f0"))
+        else:
+            painter.setPen(QPen(QColor("#ccc"), 1))
+            painter.setBrush(QColor("white"))
+        painter.drawRoundedRect(rect, 5, 5)
+
+        # Movie poster
+        poster_rect = QRect(
+            rect.x() + (rect.width() - POSTER_WIDTH) // 2,
+            rect.y() + 5,
+            POSTER_WIDTH,
+            POSTER_HEIGHT,
+        )
+        pixmap = index.data(PosterRole)
+        if pixmap is None or pixmap.isNull():
+            painter.fillRect(poster_rect, QColor("#d3d3d3"))
+        else:
+            painter.drawPixmap(
+                poster_rect.x() + (POSTER_WIDTH - pixmap.width()) // 2,
+                poster_rect.y() + (POSTER_HEIGHT - pixmap.height()) // 2,
+                pixmap,
+            )
+
+        # Movie title
+        text_rect = QRect(
+            rect.x() + 5,
+            poster_rect.bottom() + 5,
+            rect.width() - 10,
+            rect.bottom() - poster_rect.bottom() - 5,
+        )
+        font = painter.font()
+        font.setPixelSize(12)
+        painter.setFont(font)
+        painter.setPen(QColor("#333"))
+        painter.drawText(
+            text_rect,
+            Qt.AlignHCenter | Qt.AlignTop | Qt.TextWordWrap,
+            index.data(Qt.DisplayRole),
+        )
+        painter.restore()
+
+
+class MovieGridView(QListView):
+    """Virtualized poster grid; only tiles in or near the viewport are loaded"""
+
+    movie_activated = Signal(object)
+    PREFETCH_ROWS = 2
+    REFLOW_DELAY_MS = 150
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setViewMode(QListView.IconMode)
+        self.setMovement(QListView.Static)
+        # Layout on resize is handled by reflow() below
+        self.setResizeMode(QListView.Fixed)
+        self.setUniformItemSizes(True)
+        self.setGridSize(QSize(CELL_WIDTH, CELL_HEIGHT))
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setMouseTracking(True)
+        self.viewport().setCursor(Qt.PointingHandCursor)
+        self.setItemDelegate(MovieTileDelegate(self))
+        self.setStyleSheet("QListView { border: none; background-color: #f5f5f5; }")
+
+        self.columns = 0
+        self.reflow_timer = QTimer(self)
+        self.reflow_timer.setSingleShot(True)
+        self.reflow_timer.setInterval(self.REFLOW_DELAY_MS)
+        self.reflow_timer.timeout.connect(self.reflow)
+
+        self.clicked.connect(self._on_clicked)
+        self.verticalScrollBar().valueChanged.connect(self.prefetch_visible)
+
+    def _on_clicked(self, index):
+        path = index.data(PathRole)
+        if path is not None:
+            self.movie_activated.emit(path)
+
+    def column_count(self):
+        return max(1, self.viewport().width() // CELL_WIDTH)
+
+    def resizeEvent(self, event):
+        """Debounce resizes; the grid is reflowed once the user stops dragging"""
+        super().resizeEvent(event)
+        self.reflow_timer.start()
+
+    def reflow(self):
+        """Re-position existing items only if the column count changed"""
+        columns = self.column_count()
+        if columns != self.columns:
+            self.columns = columns
+            self.scheduleDelayedItemsLayout()
+        self.prefetch_visible()
+
+    def visible_rows(self):
+        """Return the (first, last) model rows in the viewport plus margin"""
+        columns = self.column_count()
+        first_row = self.verticalScrollBar().value() // CELL_HEIGHT
+        rows_on_screen = self.viewport().height() // CELL_HEIGHT + 1
+        first = (first_row - self.PREFETCH_ROWS) * columns
+        last = (first_row + rows_on_screen + self.PREFETCH_ROWS + 1) * columns - 1
+        return first, last
+
+    def prefetch_visible(self):
+        """Ask the model for posters around the current scroll position"""
+        model = self.model()
+        if isinstance(model, MovieListModel) and model.rowCount():
+            model.prefetch(*self.visible_rows())
+
+    def setModel(self, model):
+        super().setModel(model)
+        model.modelReset.connect(lambda: QTimer.singleShot(0, self.prefetch_visible))
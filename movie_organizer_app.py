@@ -1,6 +1,7 @@
 import sys
 import json
 import asyncio
+import multiprocessing
 from pathlib import Path
 from PySide6.QtWidgets import (
     QApplication,
@@ -13,9 +14,11 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import QThread, Signal
 from movie_organizer_core import MovieOrganizer
+from run_control import RunControl
 from setup_dialog import SetupDialog
 from movie_browser import MovieBrowser
 from loading_screen import LoadingScreen
+from poster_service import PosterService
 
 
 class MovieOrganizerThread(QThread):
@@ -23,19 +26,29 @@ class MovieOrganizerThread(QThread):
     finished = Signal()
     error = Signal(str)
 
-    def __init__(self, directory, api_key):
+    def __init__(self, directory, api_key, incremental=False):
         super().__init__()
         self.directory = directory
         self.api_key = api_key
+        self.incremental = incremental
+        # Cancel/pause switches the run checks between items
+        self.control = RunControl()
+        self.result = None
 
     def run(self):
         try:
 
             async def organize():
+                # Forking a process that runs Qt isn't safe; spawn parsers
                 async with MovieOrganizer(
-                    self.api_key, self.progress_callback
+                    self.api_key,
+                    self.progress_callback,
+                    control=self.control,
+                    mp_context=multiprocessing.get_context("spawn"),
                 ) as organizer:
-                    await organizer.process_movies(Path(self.directory))
+                    self.result = await organizer.process_movies(
+                        Path(self.directory), incremental=self.incremental
+                    )
 
             asyncio.run(organize())
             self.finished.emit()
@@ -56,6 +69,11 @@ class FileOrganizerApp(QMainWindow):
         self.current_directory = None
         self.api_key = None
         self.organizer_thread = None
+        self.auto_organize = False
+        # Only one organizer run at a time; requests made during a run wait
+        self.organizing = False
+        self.organize_pending = False
+        self.pending_run = None
 
         # Main widget and layout
         main_widget = QWidget()
@@ -69,9 +87,14 @@ class FileOrganizerApp(QMainWindow):
         # Create movie browser with mainwindow reference
         self.movie_browser = MovieBrowser(mainwindow=self)
         self.stacked_widget.addWidget(self.movie_browser)
+        self.movie_browser.watcher.folders_dropped.connect(
+            self.organize_dropped_folders
+        )
 
         # Create loading screen
         self.loading_screen = LoadingScreen(self)
+        self.loading_screen.pause_toggled.connect(self.pause_processing)
+        self.loading_screen.cancel_requested.connect(self.cancel_processing)
         self.loading_screen.hide()
 
         # Set application style
@@ -97,8 +120,8 @@ class FileOrganizerApp(QMainWindow):
                 sys.exit()
         else:
             if self.load_settings() and self.current_directory:
-                # If we have a saved directory, use it
-                self.process_and_show_movies(self.current_directory)
+                # If we have a saved directory, only pick up what changed
+                self.process_and_show_movies(self.current_directory, incremental=True)
             else:
                 # If no saved directory or it doesn't exist anymore, ask for a new one
                 self.select_directory()
@@ -109,6 +132,7 @@ class FileOrganizerApp(QMainWindow):
             with open("settings.json", "r") as f:
                 settings = json.load(f)
                 self.api_key = settings.get("api_key")
+                self.auto_organize = settings.get("auto_organize", False)
                 saved_directory = settings.get("directory")
                 if saved_directory and Path(saved_directory).exists():
                     self.current_directory = saved_directory
@@ -136,14 +160,25 @@ class FileOrganizerApp(QMainWindow):
 
             self.process_and_show_movies(directory)
 
-    def process_and_show_movies(self, directory):
+    def process_and_show_movies(self, directory, incremental=False):
         """Process movies and show in browser"""
         # Show loading screen
+        self.loading_screen.reset()
         self.loading_screen.center_on_parent()
         self.loading_screen.show()
 
+        if self.organizing:
+            # Started as soon as the background run in progress is done
+            self.pending_run = (directory, incremental)
+            return
+        # This run also picks up any folders dropped in the meantime
+        self.organize_pending = False
+
         # Create and start worker thread
-        self.organizer_thread = MovieOrganizerThread(directory, self.api_key)
+        self.organizing = True
+        self.organizer_thread = MovieOrganizerThread(
+            directory, self.api_key, incremental
+        )
         self.organizer_thread.progress_updated.connect(
             self.loading_screen.update_status
         )
@@ -151,23 +186,88 @@ class FileOrganizerApp(QMainWindow):
         self.organizer_thread.error.connect(self.processing_error)
         self.organizer_thread.start()
 
+    def start_pending_run(self):
+        """Start the run requested while the last one was in progress"""
+        self.organizing = False
+        if self.pending_run:
+            directory, incremental = self.pending_run
+            self.pending_run = None
+            self.process_and_show_movies(directory, incremental)
+        elif self.organize_pending:
+            self.organize_pending = False
+            self.organize_dropped_folders([])
+
+    def pause_processing(self, paused):
+        """Pause or resume the organizer between items"""
+        if self.organizer_thread:
+            if paused:
+                self.organizer_thread.control.pause()
+            else:
+                self.organizer_thread.control.resume()
+
+    def cancel_processing(self):
+        """Ask the organizer to stop at the next safe point"""
+        # A run waiting for the background run is dropped along with it
+        self.pending_run = None
+        if self.organizer_thread:
+            self.organizer_thread.control.cancel()
+
     def processing_finished(self):
         """Handle completion of movie processing"""
         self.loading_screen.hide()
         self.movie_browser.load_movies(self.current_directory)
-        QMessageBox.information(self, "Success", "Movies organized successfully!")
+        if self.organizer_thread.control.cancelled:
+            QMessageBox.information(
+                self,
+                "Stopped",
+                "Organizing was stopped. Remaining folders will be picked up "
+                "on the next run.",
+            )
+        else:
+            QMessageBox.information(self, "Success", "Movies organized successfully!")
+        self.start_pending_run()
+
+    def organize_dropped_folders(self, folders):
+        """Organize folders dropped into the library root, if enabled"""
+        if not self.auto_organize:
+            return
+        if self.organizing:
+            # Picked up by another incremental run once this one is done
+            self.organize_pending = True
+            return
+        print("Organizing newly dropped folders")
+        # Incremental runs only touch new or changed top-level folders; the
+        # library watcher shows the results as they are moved into place
+        self.organizing = True
+        self.organizer_thread = MovieOrganizerThread(
+            self.current_directory, self.api_key, incremental=True
+        )
+        self.organizer_thread.finished.connect(self.background_organize_finished)
+        self.organizer_thread.error.connect(self.background_organize_error)
+        self.organizer_thread.start()
+
+    def background_organize_finished(self):
+        self.start_pending_run()
+
+    def background_organize_error(self, error_message):
+        print(f"Error organizing new folders: {error_message}")
+        self.start_pending_run()
 
     def processing_error(self, error_message):
         """Handle errors in movie processing"""
         self.loading_screen.hide()
         QMessageBox.critical(self, "Error", f"Error processing movies: {error_message}")
+        self.start_pending_run()
 
     def closeEvent(self, event):
         """Handle application closing"""
-        # Stop the organizer thread if it's running
+        # Stop the organizer at its next safe point; a move in progress is
+        # allowed to finish so the library stays consistent
         if self.organizer_thread and self.organizer_thread.isRunning():
-            self.organizer_thread.terminate()
+            self.organizer_thread.control.cancel()
+            self.loading_screen.show_stopping()
             self.organizer_thread.wait()
+        PosterService.instance().shutdown()
         event.accept()
 
 
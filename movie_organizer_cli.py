@@ -0,0 +1,288 @@
+# movie_organizer_cli.py
+"""Headless entry point for the organizer, for cron jobs and media servers.
+
+Progress is written to stdout as one JSON object per line; anything the
+organizer prints goes to stderr. ``--dry-run`` plans the run from cached
+data only, ``--apply-plan`` executes a saved plan, ``--rollback`` undoes
+an interrupted run and ``--import-dump`` loads an offline IMDb or OMDB
+dump into the library's title index. Exit codes: 0 when every item went
+through, 1 when items failed or the run aborted, 3 when the OMDB quota ran
+out and movies were deferred to the next run, 4 when the run was stopped
+by SIGINT or SIGTERM.
+"""
+import os
+import sys
+import json
+import time
+import signal
+import asyncio
+import argparse
+import contextlib
+from dataclasses import asdict
+from pathlib import Path
+from typing import Optional
+from movie_organizer_core import GENRES, MovieOrganizer, ProcessResult
+from organize_plan import Plan
+from fetch_scheduler import FetchScheduler
+from fake_omdb import FakeOmdbServer
+from metadata_providers import OMDB_URL, LOCAL_METADATA, LocalProvider, OmdbProvider
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_DEFERRED = 3
+EXIT_CANCELLED = 4
+
+# Operations that are counters rather than percentages
+COUNTERS = {
+    "cache_hits",
+    "cache_misses",
+    "throughput",
+    "latency_p50",
+    "latency_p95",
+    "quota_remaining",
+}
+
+
+class JsonProgress:
+    """Progress callback writing JSON lines.
+
+    Percentages are emitted when they move by a whole percent; counters at
+    most once per ``interval`` seconds, so large runs stay readable.
+    """
+
+    def __init__(self, stream, interval: float = 1.0):
+        self.stream = stream
+        self.interval = interval
+        self._last_value = {}
+        self._last_time = {}
+
+    def emit(self, event: str, **fields):
+        fields = {"event": event, "time": round(time.time(), 3), **fields}
+        self.stream.write(json.dumps(fields) + "\n")
+        self.stream.flush()
+
+    def __call__(self, operation: str, value: float):
+        now = time.monotonic()
+        if operation in COUNTERS:
+            if now - self._last_time.get(operation, 0) < self.interval:
+                return
+        elif int(value) == self._last_value.get(operation) and value < 100:
+            return
+        self._last_value[operation] = int(value)
+        self._last_time[operation] = now
+        self.emit("progress", operation=operation, value=round(value, 2))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Organize a movie library into genre folders without the GUI."
+    )
+    parser.add_argument("directory", type=Path, help="movie library root")
+    parser.add_argument(
+        "--api-key",
+        default=os.environ.get("OMDB_API_KEY"),
+        help="OMDB API key (default: $OMDB_API_KEY)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="OMDB requests in flight at once (default: 8)",
+    )
+    parser.add_argument(
+        "--io-workers",
+        type=int,
+        default=8,
+        help="threads for moves and other file work (default: 8)",
+    )
+    parser.add_argument(
+        "--requests-per-second",
+        type=float,
+        default=10.0,
+        help="OMDB request rate limit (default: 10)",
+    )
+    parser.add_argument(
+        "--daily-quota",
+        type=int,
+        default=1000,
+        help="OMDB requests allowed per day, 0 for no limit (default: 1000)",
+    )
+    parser.add_argument(
+        "--provider",
+        action="append",
+        choices=["omdb", "local", "fake"],
+        help="metadata source to ask, in order; repeat to chain them "
+        "(default: local dump if imported, then omdb)",
+    )
+    parser.add_argument(
+        "--omdb-url",
+        default=OMDB_URL,
+        help="base URL of the omdb provider, e.g. a local mirror",
+    )
+    parser.add_argument(
+        "--fake-latency",
+        type=float,
+        default=0.05,
+        help="seconds the in-process fake OMDB server takes per reply "
+        "(default: 0.05)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only process folders that are new or changed since the last run",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="plan the run from cached data without changing anything",
+    )
+    parser.add_argument(
+        "--save-plan",
+        type=Path,
+        metavar="FILE",
+        help="with --dry-run, also write the plan to FILE",
+    )
+    parser.add_argument(
+        "--apply-plan",
+        type=Path,
+        metavar="FILE",
+        help="apply a plan written by --save-plan instead of a full run",
+    )
+    parser.add_argument(
+        "--allow-collisions",
+        action="store_true",
+        help="with --apply-plan, also apply moves that replace existing folders",
+    )
+    parser.add_argument(
+        "--rollback",
+        action="store_true",
+        help="undo the moves of an interrupted run instead of resuming it",
+    )
+    parser.add_argument(
+        "--import-dump",
+        type=Path,
+        metavar="FILE",
+        help="import an IMDb title.basics.tsv(.gz) or OMDB JSON dump and exit",
+    )
+    return parser.parse_args(argv)
+
+
+def dry_run(organizer: MovieOrganizer, args, progress: JsonProgress) -> int:
+    """Plan the run from cached data; nothing is fetched or changed"""
+    plan = organizer.plan_movies(args.directory, args.incremental)
+    for planned in plan.movies:
+        fields = asdict(planned)
+        del fields["data"]
+        progress.emit("plan", **fields)
+    if args.save_plan:
+        plan.save(args.save_plan)
+    progress.emit("summary", dry_run=True, **plan.summary())
+    return EXIT_OK
+
+
+def report(result: ProcessResult, progress: JsonProgress) -> int:
+    progress.emit("summary", ok=result.ok, **asdict(result))
+    if result.failed:
+        return EXIT_FAILED
+    if result.cancelled:
+        return EXIT_CANCELLED
+    if result.deferred:
+        return EXIT_DEFERRED
+    return EXIT_OK
+
+
+def build_providers(args, fake_url: Optional[str] = None):
+    """Metadata providers named on the command line, in order"""
+    providers = []
+    for name in args.provider:
+        if name == "omdb":
+            providers.append(OmdbProvider(args.api_key, base_url=args.omdb_url))
+        elif name == "local":
+            movies_info_dir = args.directory / "movies info"
+            movies_info_dir.mkdir(exist_ok=True)
+            providers.append(LocalProvider(movies_info_dir / LOCAL_METADATA))
+        else:
+            # The fake server has no daily quota but honours the rate limits
+            scheduler = FetchScheduler(
+                max_in_flight=args.concurrency,
+                requests_per_second=args.requests_per_second,
+                daily_quota=None,
+            )
+            providers.append(OmdbProvider("fake", scheduler, base_url=fake_url))
+    return providers
+
+
+async def run(organizer: MovieOrganizer, args, progress: JsonProgress) -> int:
+    # SIGINT/SIGTERM stop the run at the next safe point instead of mid-move
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, organizer.control.cancel)
+        except (NotImplementedError, RuntimeError):
+            pass
+    fake = None
+    if args.provider:
+        if "fake" in args.provider:
+            fake = FakeOmdbServer(latency=args.fake_latency, genres=GENRES)
+            await fake.start()
+        organizer.providers = build_providers(args, fake.url if fake else None)
+    try:
+        result = await organize(organizer, args)
+    finally:
+        if fake:
+            await fake.stop()
+    return report(result, progress)
+
+
+async def organize(organizer: MovieOrganizer, args) -> ProcessResult:
+    async with organizer:
+        if args.apply_plan:
+            return await organizer.apply_plan(
+                Plan.load(args.apply_plan), allow_collisions=args.allow_collisions
+            )
+        return await organizer.process_movies(
+            args.directory, incremental=args.incremental
+        )
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    progress = JsonProgress(sys.stdout)
+    if not args.directory.is_dir():
+        progress.emit("error", message=f"Not a directory: {args.directory}")
+        return EXIT_FAILED
+    offline = args.dry_run or args.apply_plan or args.rollback or args.import_dump
+    uses_omdb = not args.provider or "omdb" in args.provider
+    if not args.api_key and uses_omdb and args.omdb_url == OMDB_URL and not offline:
+        progress.emit("error", message="No OMDB API key given")
+        return EXIT_FAILED
+
+    organizer = MovieOrganizer(
+        args.api_key,
+        progress,
+        max_in_flight=args.concurrency,
+        requests_per_second=args.requests_per_second,
+        daily_quota=args.daily_quota or None,
+        io_workers=args.io_workers,
+    )
+    # Keep stdout for JSON lines only
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            if args.import_dump:
+                counts = organizer.import_dump(args.directory, args.import_dump)
+                progress.emit("summary", **counts)
+                return EXIT_OK
+            if args.rollback:
+                undone = organizer.rollback_interrupted_run(args.directory)
+                progress.emit("summary", rolled_back=undone)
+                return EXIT_OK
+            if args.dry_run:
+                return dry_run(organizer, args, progress)
+            return asyncio.run(run(organizer, args, progress))
+        except Exception as e:
+            progress.emit("error", message=str(e))
+            return EXIT_FAILED
+
+
+if __name__ == "__main__":
+    sys.exit(main())
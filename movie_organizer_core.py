@@ -1,17 +1,48 @@
 # movie_organizer_core.py
 import os
-import guessit
+import errno
 import shutil
 import aiohttp
 import asyncio
-import json
-import aiofiles
-import hashlib
-from typing import Dict, List, Optional, Callable
-from dataclasses import dataclass
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Callable, Tuple
+from dataclasses import dataclass, field
 from concurrent.futures import ThreadPoolExecutor
 import logging
 from pathlib import Path
+from omdb_cache import ResponseCache
+from library_manifest import LibraryManifest
+from fetch_scheduler import FetchScheduler
+from pipeline import Pipeline
+from release_parser import ParseCache
+from metadata_store import MetadataStore
+from poster_store import PosterStore
+from title_index import TitleIndex, rank_candidates, year_of
+from metadata_providers import (
+    OMDB_URL,
+    LOCAL_METADATA,
+    MetadataProvider,
+    OmdbProvider,
+    LocalProvider,
+    LookupFailed,
+    ProviderChain,
+)
+from run_journal import RunJournal
+from run_control import Cancelled, RunControl
+from library_walker import SPECIAL_FOLDERS, list_subdirs, walk_library
+from organize_plan import (
+    Plan,
+    PlannedMovie,
+    ORGANIZE,
+    MANUAL,
+    NEEDS_FETCH,
+    UNPARSED,
+    RENAME_TARGET_EXISTS,
+    DUPLICATE_RENAME,
+    DESTINATION_EXISTS,
+    DUPLICATE_DESTINATION,
+)
 
 
 @dataclass
@@ -24,13 +55,142 @@ class MovieInfo:
     raw_data: Dict = None
 
 
+@dataclass
+class ProcessResult:
+    """Outcome of one process_movies run"""
+
+    total: int = 0
+    organized: int = 0
+    manual_checking: int = 0
+    unparsed: int = 0
+    deferred: int = 0
+    failed: List[Dict[str, str]] = field(default_factory=list)
+    requests: int = 0
+    elapsed: float = 0.0
+    cancelled: bool = False
+    # Seconds spent per stage, summed over the stage's workers
+    stage_times: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
 class MovieOrganizer:
-    def __init__(self, api_key: str, progress_callback: Callable = None):
+    SAVE_BATCH_SIZE = 50
+
+    def __init__(
+        self,
+        api_key: str,
+        progress_callback: Callable = None,
+        cache_ttl: float = 30 * 24 * 3600,
+        negative_cache_ttl: float = 7 * 24 * 3600,
+        cache_size: int = 20000,
+        max_in_flight: int = 8,
+        requests_per_second: float = 10.0,
+        daily_quota: Optional[int] = 1000,
+        io_workers: int = 8,
+        moves_per_device: int = 2,
+        control: Optional[RunControl] = None,
+        providers: Optional[List[MetadataProvider]] = None,
+        mp_context=None,
+    ):
         self.api_key = api_key
         self.progress_callback = progress_callback or (lambda x, y: None)
         self.logger = logging.getLogger(__name__)
         self.session = None
         self.GENRES = set(GENRES)
+        self.cache_ttl = cache_ttl
+        self.negative_cache_ttl = negative_cache_ttl
+        self.cache_size = cache_size
+        self.cache: Optional[ResponseCache] = None
+        self.manifest: Optional[LibraryManifest] = None
+        self.max_in_flight = max_in_flight
+        self.requests_per_second = requests_per_second
+        self.daily_quota = daily_quota
+        self.scheduler: Optional[FetchScheduler] = None
+        # Metadata sources asked in order; None means local dump, then OMDB
+        self.providers = providers
+        self.chain: Optional[ProviderChain] = None
+        self.io_workers = io_workers
+        self.moves_per_device = moves_per_device
+        # Cancel/pause switches, checked between items
+        self.control = control or RunControl()
+        self._io_executor: Optional[ThreadPoolExecutor] = None
+        self._device_limits: Dict[int, asyncio.Semaphore] = {}
+        self._devices: Dict[Path, int] = {}
+        # Multiprocessing context for batch parsing; None is the platform's
+        self.mp_context = mp_context
+        self.parser = ParseCache()
+        self.metadata: Optional[MetadataStore] = None
+        self.posters: Optional[PosterStore] = None
+        self.titles: Optional[TitleIndex] = None
+        self.journal: Optional[RunJournal] = None
+
+    def open_cache(self, movies_info_dir: Path) -> ResponseCache:
+        """Open the OMDB response cache stored in the movies info folder"""
+        self.cache = ResponseCache(
+            movies_info_dir / "omdb_cache.json",
+            ttl=self.cache_ttl,
+            negative_ttl=self.negative_cache_ttl,
+            max_entries=self.cache_size,
+        )
+        return self.cache
+
+    def open_scheduler(self, movies_info_dir: Path) -> FetchScheduler:
+        """Create the request scheduler, tracking the daily quota on disk"""
+        self.scheduler = FetchScheduler(
+            max_in_flight=self.max_in_flight,
+            requests_per_second=self.requests_per_second,
+            daily_quota=self.daily_quota,
+            quota_path=movies_info_dir / "omdb_quota.json",
+            progress_callback=self.progress_callback,
+        )
+        return self.scheduler
+
+    def open_providers(self, movies_info_dir: Optional[Path] = None) -> ProviderChain:
+        """Set up the chain of metadata providers for a run.
+
+        Without explicit providers, records imported into the library with
+        ``import_dump`` answer first and OMDB handles the rest. Providers
+        without a scheduler get one with the organizer's limits; the real
+        OMDB's also tracks the daily quota on disk.
+        """
+        providers = self.providers
+        if providers is None:
+            providers = []
+            if movies_info_dir and (movies_info_dir / LOCAL_METADATA).exists():
+                providers.append(LocalProvider(movies_info_dir / LOCAL_METADATA))
+            providers.append(OmdbProvider(self.api_key))
+        for provider in providers:
+            if provider.scheduler is not None:
+                continue
+            if isinstance(provider, OmdbProvider):
+                if movies_info_dir and provider.base_url == OMDB_URL:
+                    provider.scheduler = self.open_scheduler(movies_info_dir)
+                    continue
+                rate, quota = self.requests_per_second, None
+            else:
+                rate, quota = None, None
+            provider.scheduler = FetchScheduler(
+                max_in_flight=self.max_in_flight,
+                requests_per_second=rate,
+                daily_quota=quota,
+                progress_callback=self.progress_callback,
+            )
+        # Throughput and quota reports follow the first network provider
+        self.scheduler = next(
+            (p.scheduler for p in providers if isinstance(p, OmdbProvider)),
+            providers[0].scheduler,
+        )
+        self.chain = ProviderChain(providers)
+        return self.chain
+
+    def _report_cache_stats(self):
+        """Send cache hit/miss counters to the progress callback"""
+        if self.cache:
+            self.progress_callback("cache_hits", self.cache.hits)
+            self.progress_callback("cache_misses", self.cache.misses)
 
     async def __aenter__(self):
         self.session = aiohttp.ClientSession()
@@ -39,6 +199,34 @@ class MovieOrganizer:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self.session:
             await self.session.close()
+        if self.chain:
+            await self.chain.close()
+        if self._io_executor:
+            self._io_executor.shutdown(wait=True)
+            self._io_executor = None
+
+    @property
+    def io_executor(self) -> ThreadPoolExecutor:
+        """Long-lived thread pool for blocking filesystem work"""
+        if self._io_executor is None:
+            self._io_executor = ThreadPoolExecutor(
+                max_workers=self.io_workers, thread_name_prefix="organizer-io"
+            )
+        return self._io_executor
+
+    def _device_limit(self, path: Path) -> asyncio.Semaphore:
+        """Semaphore bounding concurrent moves onto the device holding ``path``"""
+        parent = path.parent
+        device = self._devices.get(parent)
+        if device is None:
+            try:
+                device = os.stat(parent).st_dev
+            except OSError:
+                device = -1
+            self._devices[parent] = device
+        if device not in self._device_limits:
+            self._device_limits[device] = asyncio.Semaphore(self.moves_per_device)
+        return self._device_limits[device]
 
     def _sanitize_filename(self, filename: str) -> str:
         """Sanitize filename to remove invalid characters"""
@@ -46,124 +234,267 @@ class MovieOrganizer:
             char for char in filename if char.isalnum() or char in " ._-"
         ).strip()
 
+    def renamed_name(self, name: str) -> str:
+        """Folder name rename_folder gives a folder called ``name``"""
+        if name in self.GENRES or name in SPECIAL_FOLDERS:
+            return name
+
+        movie_info = self.parser.parse(name.replace("-", " "))
+        if "title" not in movie_info:
+            return name
+        # "Title Year Quality": the year stays in the name so it tells
+        # remakes apart, also on the next run if this one stops before the
+        # folder is looked up
+        parts = [movie_info["title"]]
+        if "year" in movie_info:
+            parts.append(str(movie_info["year"]))
+        if movie_info.get("screen_size"):
+            parts.append(str(movie_info["screen_size"]))
+        return self._sanitize_filename(" ".join(parts)) or name
+
     async def rename_folder(self, path: Path) -> Path:
         """Rename a folder based on movie information"""
-        if (
-            path.name in self.GENRES
-            or path.name == "Manual Checking"
-            or path.name == "movies info"
-        ):
-            return path
-
-        movie_info = guessit.guessit(path.name.replace("-", " "))
-        if "title" in movie_info:
-            title = movie_info["title"]
-            quality = str(movie_info.get("screen_size", ""))
-            new_name = f"{title} ({quality})" if quality else title
-            new_name = self._sanitize_filename(new_name)
-            new_path = path.parent / new_name
-
-            if path != new_path:
-                try:
-                    await self._safe_move(path, new_path)
-                    self.logger.info(f"Renamed: {path} to {new_path}")
-                    return new_path
-                except Exception as e:
-                    self.logger.error(f"Error renaming {path}: {str(e)}")
-                    return path
+        new_path = path.parent / self.renamed_name(path.name)
+        if path != new_path:
+            try:
+                await self._safe_move(path, new_path)
+                self.logger.info(f"Renamed: {path} to {new_path}")
+                return new_path
+            except Exception as e:
+                self.logger.error(f"Error renaming {path}: {str(e)}")
         return path
 
-    async def fetch_movie_details(self, title: str, retries: int = 3) -> Optional[Dict]:
-        """Fetch movie details from OMDB API"""
-        url = f"http://www.omdbapi.com/?t={title}&apikey={self.api_key}"
+    def cached_details(
+        self, cache: ResponseCache, title: str, year: Optional[str] = None
+    ) -> Tuple[bool, Optional[Dict]]:
+        """Look a title up in the response cache and title index only.
 
-        for attempt in range(retries):
-            try:
-                async with self.session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data.get("Response") == "True":
-                            return data
-                    await asyncio.sleep(1)
-            except Exception as e:
-                self.logger.error(f"Error fetching details for {title}: {str(e)}")
-                await asyncio.sleep(2**attempt)  # Exponential backoff
-        return None
+        Several cache keys may be tried; the lookup counts as one hit or miss.
+        """
+        hit, cached = cache.get(title, year, count=False)
+        if not hit and year:
+            # Answers cached without a year still count if they are for the
+            # film from that year
+            hit, cached = cache.get(title, None, count=False)
+            if hit and not (cached and year_of(cached.get("Year")) == year_of(year)):
+                hit, cached = False, None
+        if not hit:
+            imdb_id = self.titles.resolve(title, year) if self.titles else None
+            if imdb_id:
+                hit, cached = cache.get_id(imdb_id, count=False)
+        cache.count(hit)
+        return hit, cached
+
+    async def _query(self, params: Dict) -> Optional[Dict]:
+        """Ask the metadata providers; returns the answer, or None on failure"""
+        chain = self.chain or self.open_providers()
+        return await chain.query(params)
+
+    async def fetch_by_id(self, imdb_id: str) -> Optional[Dict]:
+        """Fetch a movie by IMDb ID; returns OMDB's answer or None on failure"""
+        if self.cache:
+            # Counted by the title lookup that led here
+            hit, cached = self.cache.get_id(imdb_id, count=False)
+            if hit:
+                return cached or {"Response": "False"}
+        data = await self._query({"i": imdb_id})
+        if data is not None and self.cache:
+            self.cache.put_id(imdb_id, data if data.get("Response") == "True" else None)
+        return data
+
+    async def search_title(
+        self, title: str, year: Optional[str] = None
+    ) -> Optional[Dict]:
+        """Find a title with OMDB's search and fetch the best ranked match"""
+        data = await self._query({"s": title})
+        if data is None:
+            return None
+        best = rank_candidates(title, year, data.get("Search") or [])
+        if best is None:
+            return {"Response": "False"}
+        return await self.fetch_by_id(best["imdbID"])
+
+    async def fetch_movie_details(
+        self, title: str, year: Optional[str] = None
+    ) -> Optional[Dict]:
+        """Fetch movie details from OMDB API, going through the cache first.
+
+        Titles the title index knows are fetched by IMDb ID. Others are
+        looked up by title and year, falling back to a ranked search, and
+        the ID they resolve to is pinned so the next run fetches by ID.
+        Returns None for titles that aren't found, and raises LookupFailed
+        when the providers couldn't be asked.
+        """
+        if self.cache:
+            hit, cached = self.cached_details(self.cache, title, year)
+            if hit:
+                return cached
+
+        imdb_id = self.titles.resolve(title, year) if self.titles else None
+        if imdb_id:
+            data = await self.fetch_by_id(imdb_id)
+        else:
+            data = await self._query({"t": title, "y": year})
+            if data is not None and data.get("Response") != "True":
+                data = await self.search_title(title, year)
+        if data is None:
+            # The lookup failed rather than found nothing; try again next run
+            raise LookupFailed(f"Could not look up {title}")
+
+        # A definite "not found" answer is cached too
+        details = data if data.get("Response") == "True" else None
+        if details and self.titles and details.get("imdbID"):
+            self.titles.pin(title, year, details["imdbID"])
+        if self.cache:
+            self.cache.put(title, year, details)
+        return details
+
+    def import_dump(self, directory: Path, dump_path: Path) -> Dict[str, int]:
+        """Import an offline IMDb or OMDB dump into the library's title index.
+
+        OMDB records are also kept by the local metadata provider, which
+        answers for the titles they cover without a request. They stay out
+        of the response cache so they never evict real lookups.
+        """
+        movies_info_dir = directory / "movies info"
+        movies_info_dir.mkdir(exist_ok=True)
+        titles = TitleIndex(movies_info_dir / "title_index.db")
+        try:
+            indexed, records = titles.import_dump(dump_path)
+        finally:
+            titles.close()
+        if records:
+            LocalProvider(movies_info_dir / LOCAL_METADATA).import_records(records)
+        return {"indexed": indexed, "details": len(records)}
 
     async def download_poster(
-        self, poster_url: str, movie_name: str, movies_info_dir: Path
+        self, poster_url: str, movie_name: str, imdb_id: Optional[str] = None
     ) -> Optional[Path]:
-        """Download movie poster and save it locally"""
-        if not poster_url or poster_url == "N/A":
+        """Local copy of a movie's poster from the shared poster store"""
+        return await self.posters.fetch(self.session, poster_url, movie_name, imdb_id)
+
+    def collect_posters(self, directory: Path) -> int:
+        """Remove posters no folder in the library uses any more"""
+        live = [
+            folder.name for _, folders in walk_library(directory) for folder in folders
+        ]
+        live += [folder.name for folder in list_subdirs(directory / "Manual Checking")]
+        # Posters saved before the store existed are still referenced by path
+        keep = [
+            data["LocalPoster"]
+            for data in self.metadata.get_many(live).values()
+            if data.get("LocalPoster")
+        ]
+        removed = self.posters.collect(live, keep)
+        if removed:
+            self.logger.info(f"Removed {removed} unused posters")
+        return removed
+
+    def _parse_movie(self, path: Path) -> Optional[MovieInfo]:
+        """Build a MovieInfo from a folder name, or None if it has no title"""
+        movie_data = self.parser.parse(path.name)
+        if "title" not in movie_data:
             return None
+        return MovieInfo(
+            title=movie_data["title"],
+            quality=movie_data.get("screen_size", ""),
+            path=path,
+            year=str(movie_data["year"]) if "year" in movie_data else None,
+        )
 
-        try:
-            # Create posters directory if it doesn't exist
-            posters_dir = movies_info_dir / "posters"
-            posters_dir.mkdir(exist_ok=True)
-
-            # Generate a unique filename using hash of movie name
-            poster_hash = hashlib.md5(movie_name.encode()).hexdigest()
-            file_extension = poster_url.split(".")[-1].split("?")[
-                0
-            ]  # Get extension without query params
-            if file_extension not in ["jpg", "jpeg", "png"]:
-                file_extension = "jpg"  # Default to jpg
-
-            poster_path = posters_dir / f"{poster_hash}.{file_extension}"
-
-            # If poster already exists, return the path
-            if poster_path.exists():
-                return poster_path
-
-            # Download the poster
-            async with self.session.get(poster_url) as response:
-                if response.status == 200:
-                    async with aiofiles.open(poster_path, "wb") as f:
-                        await f.write(await response.read())
-                    return poster_path
+    def _start_journal(self, directory: Path, **info):
+        """Recover whatever an interrupted run left behind, then journal this one"""
+        self.journal = RunJournal(directory / "movies info" / "run_journal.jsonl")
+        if self.journal.exists():
+            self._recover_journal(directory)
+        self.journal.begin_run(directory, **info)
 
-        except Exception as e:
-            self.logger.error(f"Error downloading poster for {movie_name}: {str(e)}")
-        return None
-
-    def scan_directory(self, directory: Path) -> List[MovieInfo]:
-        """Scan directory and return movie information"""
-        movie_infos = []
-        paths = [p for p in directory.iterdir() if p.is_dir()]
-
-        for i, path in enumerate(paths):
-            if (
-                path.name in self.GENRES
-                or path.name == "Manual Checking"
-                or path.name == "movies info"
-            ):
+    def _recover_journal(self, directory: Path):
+        """Keep the work an interrupted run completed.
+
+        Half-done moves are finished or undone, fetched details go back into
+        the response cache, and folders that already reached their genre or
+        Manual Checking folder get their metadata and manifest entries, so
+        the resumed run only handles what is left at the top level.
+        """
+        state = self.journal.recover()
+        if self.cache:
+            for title, year, details in state.responses:
+                self.cache.put(title, year, details)
+
+        writes = []
+        placed = 0
+        for move in state.moves:
+            destination = Path(move.dst)
+            if not move.done or destination.parent == directory:
                 continue
+            if not destination.exists():
+                continue
+            details = state.fetches.get(destination.name)
+            if details:
+                writes.append((destination.name, details))
+            imdb_id = details.get("imdbID") if details else None
+            self.manifest.record(destination, imdb_id)
+            placed += 1
+        if writes:
+            self.metadata.put_many(writes)
+        print(
+            f"Recovered interrupted run: {placed} movies already placed, "
+            f"{len(state.responses)} lookups kept"
+        )
 
-            movie_data = guessit.guessit(path.name)
-            if "title" in movie_data:
-                movie_infos.append(
-                    MovieInfo(
-                        title=movie_data["title"],
-                        quality=str(movie_data.get("screen_size", "")),
-                        path=path,
-                    )
-                )
+    def rollback_interrupted_run(self, directory: Path) -> int:
+        """Undo the moves of an interrupted run; returns how many were undone"""
+        journal = RunJournal(directory / "movies info" / "run_journal.jsonl")
+        if not journal.exists():
+            return 0
+        state = journal.read()
+        undone = journal.rollback()
+        manifest = LibraryManifest(directory)
+        for move in state.moves:
+            manifest.forget(Path(move.dst))
+        manifest.save()
+        return undone
 
-            self.progress_callback("scanning", i / len(paths) * 100)
+    def pending_folders(self, directory: Path, incremental: bool = False) -> List[Path]:
+        """Top-level folders a run would process; nothing is written"""
+        paths = list_subdirs(directory, SPECIAL_FOLDERS | self.GENRES)
+        if incremental:
+            if self.manifest is None:
+                self.manifest = LibraryManifest(directory)
+            paths = [p for p in paths if self.manifest.is_changed(p)]
+        return paths
 
-        return movie_infos
+    async def process_movies(
+        self, directory: Path, incremental: bool = False
+    ) -> ProcessResult:
+        """Main processing function.
 
-    async def process_movies(self, directory: Path):
-        """Main processing function"""
+        With ``incremental`` set, only folders that are new or changed since
+        the last run (according to the library manifest) are processed, and
+        genre folders are created on demand instead of up front. Returns a
+        ProcessResult with per-outcome counts and any failed items.
+        """
+        started = time.monotonic()
         try:
             # First ensure "movies info" folder is created in root directory
             movies_info_dir = directory / "movies info"
             movies_info_dir.mkdir(exist_ok=True)
+            self.open_cache(movies_info_dir)
+            self.open_providers(movies_info_dir)
+            self.manifest = LibraryManifest(directory)
+            self.parser = ParseCache(
+                movies_info_dir / "parse_cache.json", mp_context=self.mp_context
+            )
+            self.metadata = MetadataStore.for_library(directory)
+            self.posters = PosterStore(movies_info_dir / "posters")
+            self.titles = TitleIndex(movies_info_dir / "title_index.db")
+            self._start_journal(directory, incremental=incremental)
 
             # Create genre folders
-            for genre in self.GENRES:
-                (directory / genre).mkdir(exist_ok=True)
+            if not incremental:
+                for genre in self.GENRES:
+                    (directory / genre).mkdir(exist_ok=True)
 
             # Create Manual Checking folder
             manual_checking = directory / "Manual Checking"
@@ -190,112 +521,399 @@ class MovieOrganizer:
                         f"Warning: Could not fully cleanup duplicate movies info folder: {e}"
                     )
 
-            # First rename all movie folders
-            paths = [p for p in directory.iterdir() if p.is_dir()]
-            total_paths = len(paths)
-
-            for i, path in enumerate(paths):
-                if (
-                    path.name not in self.GENRES
-                    and path.name != "Manual Checking"
-                    and path.name != "movies info"
-                ):
-                    await self.rename_folder(path)
-                    self.progress_callback("renaming", (i + 1) / total_paths * 100)
-
-            # Scan directory after renaming
-            movies = self.scan_directory(directory)
-
-            # Process movies with poster downloads
-            async def process_movie(movie: MovieInfo):
-                details = await self.fetch_movie_details(movie.title)
-                if details:
-                    try:
-                        # Download poster if available
-                        poster_path = None
-                        if details.get("Poster"):
-                            poster_path = await self.download_poster(
-                                details["Poster"], movie.path.name, movies_info_dir
-                            )
-                            if poster_path:
-                                # Update the poster path in the details
-                                details["LocalPoster"] = str(poster_path)
-
-                        # Save movie info to JSON
-                        info_path = movies_info_dir / f"{movie.path.name}_about.json"
-                        with open(info_path, "w", encoding="utf-8") as f:
-                            json.dump(details, f, indent=4, ensure_ascii=False)
-                    except Exception as e:
-                        print(f"Error saving movie info for {movie.title}: {e}")
+            # Top-level movie folders to feed into the pipeline
+            paths = self.pending_folders(directory, incremental)
+            result = ProcessResult(total=len(paths))
+
+            loop = asyncio.get_running_loop()
+
+            def parse_names():
+                def stop():
+                    return self.control.cancelled
+
+                self.parser.parse_many(
+                    [p.name.replace("-", " ") for p in paths], None, stop
+                )
+                if stop():
+                    return
+                # The scanning stage parses the renamed names; batch them too
+                self.parser.parse_many(
+                    [self.renamed_name(p.name) for p in paths], None, stop
+                )
 
+            # Parse every name up front so large cold libraries use all cores
+            parse_started = time.monotonic()
+            await loop.run_in_executor(None, parse_names)
+            result.stage_times["parsing"] = time.monotonic() - parse_started
+
+            async def parse(path: Path) -> Optional[MovieInfo]:
+                movie = await loop.run_in_executor(None, self._parse_movie, path)
+                if movie is None and path.exists():
+                    # Folders guessit can't make sense of stay where they are;
+                    # remember them so incremental runs skip them until they change
+                    self.manifest.record(path)
+                return movie
+
+            async def fetch(movie: MovieInfo) -> MovieInfo:
+                # A failed lookup fails the item, so the folder stays at the
+                # top level for the next run instead of going to Manual Checking
+                try:
+                    details = await self.fetch_movie_details(movie.title, movie.year)
+                finally:
+                    self._report_cache_stats()
+                    self.scheduler.report_throughput()
+                if details:
+                    self.journal.log_fetch(
+                        movie.path.name, movie.title, movie.year, details
+                    )
                     movie.genres = details.get("Genre", "").split(", ")
                     movie.year = details.get("Year")
                     movie.raw_data = details
                 return movie
 
-            # Process in batches to avoid overwhelming the API
-            batch_size = 5
-            processed_movies = []
-            total_batches = (len(movies) + batch_size - 1) // batch_size
+            async def poster(movie: MovieInfo) -> MovieInfo:
+                if movie.raw_data and movie.raw_data.get("Poster"):
+                    poster_path = await self.download_poster(
+                        movie.raw_data["Poster"],
+                        movie.path.name,
+                        movie.raw_data.get("imdbID"),
+                    )
+                    if poster_path:
+                        # Update the poster path in the details
+                        movie.raw_data["LocalPoster"] = str(poster_path)
+                return movie
+
+            pending_writes = []
+
+            async def flush_writes():
+                if not pending_writes:
+                    return
+                batch = pending_writes[:]
+                pending_writes.clear()
+                try:
+                    await loop.run_in_executor(
+                        self.io_executor, self.metadata.put_many, batch
+                    )
+                except Exception as e:
+                    print(f"Error saving movie info for {len(batch)} movies: {e}")
 
-            for i in range(0, len(movies), batch_size):
-                batch = movies[i : i + batch_size]
-                batch_results = await asyncio.gather(
-                    *[process_movie(movie) for movie in batch]
+            async def save(movie: MovieInfo) -> MovieInfo:
+                # Metadata is written to the store in batched transactions
+                if movie.raw_data:
+                    pending_writes.append((movie.path.name, movie.raw_data))
+                    if len(pending_writes) >= self.SAVE_BATCH_SIZE:
+                        await flush_writes()
+                return movie
+
+            async def move(movie: MovieInfo) -> MovieInfo:
+                # Moves run in parallel on the I/O pool, bounded per device
+                await self._organize_movie(directory, movie)
+                return movie
+
+            # Each movie flows through the stages on its own, so renames, API
+            # calls, poster downloads and moves for different movies overlap.
+            # Renames stay single-file since two folders may map to one name.
+            # Lookups have no side effects on disk, so cancelling abandons them.
+            pipeline = (
+                Pipeline(self.progress_callback, control=self.control)
+                .add_stage("renaming", self.rename_folder)
+                .add_stage("scanning", parse, workers=2)
+                .add_stage(
+                    "fetching", fetch, workers=self.max_in_flight, interruptible=True
                 )
-                processed_movies.extend(batch_results)
-                self.progress_callback("fetching", (i + len(batch)) / len(movies) * 100)
+                .add_stage("posters", poster, workers=4)
+                .add_stage("saving", save)
+                .add_stage("organizing", move, workers=self.io_workers)
+            )
+            processed_movies = await pipeline.run(paths)
+            self.scheduler.report_throughput(force=True)
+            for stage in pipeline.stages:
+                result.stage_times[stage.name] = stage.busy
+            await flush_writes()
+            self.cache.save()
+
+            result.manual_checking = sum(
+                1 for m in processed_movies if m.path.parent == manual_checking
+            )
+            result.organized = len(processed_movies) - result.manual_checking
+            scanning, fetching = pipeline.stages[1], pipeline.stages[2]
+            result.unparsed = scanning.dropped - len(scanning.failed)
+            result.deferred = fetching.dropped - len(fetching.failed)
+            for stage in pipeline.stages:
+                for item, error in zip(stage.failed, stage.errors):
+                    result.failed.append(
+                        {
+                            "stage": stage.name,
+                            "item": str(getattr(item, "path", item)),
+                            "error": error,
+                        }
+                    )
+            result.requests = self.chain.requests_made
+            result.cancelled = self.control.cancelled
 
-            # Organize movies
-            await self._organize_movies(directory, processed_movies)
+            if result.cancelled:
+                # Every move either happened or didn't; what is still at the
+                # top level is picked up by the next run
+                print(f"Run cancelled after {len(processed_movies)} movies")
+                if not incremental:
+                    await self._cleanup_empty_folders(directory)
+                self.journal.finish()
+                result.elapsed = time.monotonic() - started
+                return result
 
-            # Clean up empty folders at the end
-            await self._cleanup_empty_folders(directory)
+            if result.deferred:
+                # Unfetched folders stay in place for the next run to pick up
+                print(
+                    f"OMDB quota reached, {result.deferred} movies deferred to next run"
+                )
+
+            # Clean up empty folders at the end; incremental runs never
+            # create empty genre folders in the first place
+            if not incremental:
+                await self._cleanup_empty_folders(directory)
+                await loop.run_in_executor(
+                    self.io_executor, self.collect_posters, directory
+                )
+            else:
+                self.progress_callback("cleaning", 100)
 
             # Write summary
             self._write_summary(directory, processed_movies)
+            self.journal.finish()
+            result.elapsed = time.monotonic() - started
+            return result
 
         except Exception as e:
             print(f"Error in process_movies: {e}")
             raise
+        finally:
+            if self.journal:
+                self.journal.close()
+            if self.cache:
+                self.cache.save()
+            if self.manifest:
+                self.manifest.save()
+            if self.posters:
+                self.posters.save()
+            if self.titles:
+                self.titles.close()
+                self.titles = None
+            if self.scheduler:
+                self.scheduler.save_quota()
+            self.parser.save()
 
-    async def _organize_movies(self, directory: Path, movies: List[MovieInfo]):
-        """Organize movies into genre folders"""
-        for i, movie in enumerate(movies):
-            if not movie.genres:
-                await self._move_to_manual_checking(directory, movie)
-                continue
+    def genre_for(self, details: Optional[Dict]) -> Optional[str]:
+        """Genre folder a movie with these OMDB details goes to, if any"""
+        genres = (details or {}).get("Genre", "").split(", ")
+        return genres[0] if genres[0] in self.GENRES else None
+
+    def plan_movies(self, directory: Path, incremental: bool = False) -> Plan:
+        """Work out what process_movies would do, from cached data only.
 
-            main_genre = movie.genres[0]
-            if main_genre in self.GENRES:
-                genre_path = directory / main_genre
-                new_path = genre_path / movie.path.name
-                await self._safe_move(movie.path, new_path)
+        Reads the folder listing, the parse cache, the OMDB response cache
+        and the manifest; makes no requests and writes nothing. Folders the
+        cache knows nothing about are marked as needing a fetch.
+        """
+        movies_info_dir = directory / "movies info"
+        cache = ResponseCache(
+            movies_info_dir / "omdb_cache.json",
+            ttl=self.cache_ttl,
+            negative_ttl=self.negative_cache_ttl,
+            max_entries=self.cache_size,
+        )
+        self.parser = ParseCache(
+            movies_info_dir / "parse_cache.json", mp_context=self.mp_context
+        )
+        titles_path = movies_info_dir / "title_index.db"
+        if titles_path.exists():
+            self.titles = TitleIndex(titles_path.resolve(), read_only=True)
+        manual_checking = directory / "Manual Checking"
+
+        paths = self.pending_folders(directory, incremental)
+        self.parser.parse_many([p.name.replace("-", " ") for p in paths])
+        renamed = [p.parent / self.renamed_name(p.name) for p in paths]
+        self.parser.parse_many([p.name for p in renamed])
+
+        plan = Plan(root=str(directory), incremental=incremental)
+        for path, new_path in zip(paths, renamed):
+            planned = PlannedMovie(
+                source=str(path), renamed=str(new_path), status=UNPARSED
+            )
+            movie = self._parse_movie(new_path)
+            if movie:
+                planned.title, planned.year = movie.title, movie.year
+                hit, details = self.cached_details(cache, movie.title, movie.year)
+                if not hit:
+                    planned.status = NEEDS_FETCH
+                else:
+                    planned.genre = self.genre_for(details)
+                    planned.status = ORGANIZE if planned.genre else MANUAL
+                    target = (
+                        directory / planned.genre if planned.genre else manual_checking
+                    )
+                    planned.destination = str(target / new_path.name)
+                    planned.imdb_id = details.get("imdbID") if details else None
+                    planned.data = details
+            plan.movies.append(planned)
+
+        # Moves onto an existing folder replace it; flag them for review
+        rename_counts = Counter(m.renamed for m in plan.movies)
+        destination_counts = Counter(m.destination for m in plan.movies)
+        for planned in plan.movies:
+            if planned.renamed != planned.source:
+                if rename_counts[planned.renamed] > 1:
+                    planned.collisions.append(DUPLICATE_RENAME)
+                elif Path(planned.renamed).exists():
+                    planned.collisions.append(RENAME_TARGET_EXISTS)
+            if planned.destination:
+                if destination_counts[planned.destination] > 1:
+                    planned.collisions.append(DUPLICATE_DESTINATION)
+                elif Path(planned.destination).exists():
+                    planned.collisions.append(DESTINATION_EXISTS)
+        if self.titles:
+            self.titles.close()
+            self.titles = None
+        return plan
+
+    async def apply_plan(
+        self, plan: Plan, allow_collisions: bool = False
+    ) -> ProcessResult:
+        """Apply the resolved moves of a plan in bulk.
+
+        Each folder moves straight to its destination under its final name.
+        Moves are grouped by destination folder: different genres fill in
+        parallel, one move at a time per folder. Folders that still need a
+        fetch or have no title are left alone, as are collisions unless
+        ``allow_collisions`` is set.
+        """
+        started = time.monotonic()
+        directory = Path(plan.root)
+        self.manifest = LibraryManifest(directory)
+        self.metadata = MetadataStore.for_library(directory)
+        self._start_journal(directory, plan=True)
+        result = ProcessResult(total=len(plan.movies))
+        loop = asyncio.get_running_loop()
+
+        groups: Dict[Path, List[PlannedMovie]] = {}
+        for planned in plan.movies:
+            if planned.status == NEEDS_FETCH:
+                result.deferred += 1
+            elif planned.status == UNPARSED:
+                result.unparsed += 1
+            elif planned.collisions and not allow_collisions:
+                result.failed.append(
+                    {
+                        "stage": "planning",
+                        "item": planned.source,
+                        "error": "collision: " + ", ".join(planned.collisions),
+                    }
+                )
             else:
-                await self._move_to_manual_checking(directory, movie)
+                destination = Path(planned.destination)
+                groups.setdefault(destination.parent, []).append(planned)
+
+        total = sum(len(items) for items in groups.values())
+        done = 0
+        writes = []
+
+        async def fill(folder: Path, items: List[PlannedMovie]):
+            nonlocal done
+            await loop.run_in_executor(
+                self.io_executor, lambda: folder.mkdir(exist_ok=True)
+            )
+            for planned in items:
+                try:
+                    await self.control.checkpoint()
+                except Cancelled:
+                    return
+                source, destination = Path(planned.source), Path(planned.destination)
+                try:
+                    if not source.exists():
+                        raise FileNotFoundError(f"{source} no longer exists")
+                    await self._safe_move(source, destination)
+                    self.manifest.record(destination, planned.imdb_id)
+                    if planned.data:
+                        writes.append((destination.name, planned.data))
+                    if planned.status == MANUAL:
+                        result.manual_checking += 1
+                    else:
+                        result.organized += 1
+                except Exception as e:
+                    result.failed.append(
+                        {"stage": "organizing", "item": planned.source, "error": str(e)}
+                    )
+                done += 1
+                self.progress_callback("organizing", done / total * 100)
+
+        try:
+            await asyncio.gather(*[fill(f, items) for f, items in groups.items()])
+            if writes:
+                await loop.run_in_executor(
+                    self.io_executor, self.metadata.put_many, writes
+                )
+            self.journal.finish()
+        finally:
+            self.journal.close()
+            self.manifest.save()
+        result.cancelled = self.control.cancelled
+        result.elapsed = time.monotonic() - started
+        return result
 
-            self.progress_callback("organizing", (i + 1) / len(movies) * 100)
+    async def _organize_movie(self, directory: Path, movie: MovieInfo):
+        """Move a single movie into its genre folder or Manual Checking"""
+        if not movie.genres or movie.genres[0] not in self.GENRES:
+            await self._move_to_manual_checking(directory, movie)
+            return
+
+        genre_path = directory / movie.genres[0]
+        await asyncio.get_running_loop().run_in_executor(
+            self.io_executor, lambda: genre_path.mkdir(exist_ok=True)
+        )
+        new_path = genre_path / movie.path.name
+        await self._safe_move(movie.path, new_path)
+        movie.path = new_path
+        self._record_processed(movie)
 
-    @staticmethod
-    async def _safe_move(src: Path, dst: Path):
-        """Safely move files using asyncio"""
+    def _record_processed(self, movie: MovieInfo):
+        """Add a movie's final location to the library manifest"""
+        if self.manifest:
+            imdb_id = movie.raw_data.get("imdbID") if movie.raw_data else None
+            self.manifest.record(movie.path, imdb_id)
+
+    async def _safe_move(self, src: Path, dst: Path):
+        """Move a folder on the shared I/O pool.
+
+        Same-filesystem moves are a single rename; copy+delete only happens
+        when the destination is on another device. During a run every move
+        goes through the run journal.
+        """
         if src == dst:
             return
 
         def _move():
+            if self.journal is not None:
+                self.journal.move(src, dst)
+                return
             if dst.exists():
                 shutil.rmtree(str(dst))
-            shutil.move(str(src), str(dst))
+            try:
+                os.rename(src, dst)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                shutil.move(str(src), str(dst))
 
-        loop = asyncio.get_event_loop()
-        with ThreadPoolExecutor() as pool:
-            await loop.run_in_executor(pool, _move)
+        loop = asyncio.get_running_loop()
+        async with self._device_limit(dst):
+            await loop.run_in_executor(self.io_executor, _move)
 
     async def _move_to_manual_checking(self, directory: Path, movie: MovieInfo):
         """Move a movie to the manual checking folder"""
         manual_checking = directory / "Manual Checking"
         new_path = manual_checking / movie.path.name
         await self._safe_move(movie.path, new_path)
+        movie.path = new_path
+        self._record_processed(movie)
 
     async def _cleanup_empty_folders(self, directory: Path):
         """Remove empty genre folders"""
@@ -325,7 +943,8 @@ class MovieOrganizer:
         try:
             with open(directory / "process_summary.txt", "w", encoding="utf-8") as f:
                 f.write(
-                    f"{manual_checking} / {total_movies} movies are in 'Manual Checking'"
+                    f"{manual_checking} / {total_movies} movies are in "
+                    "'Manual Checking'"
                 )
         except Exception as e:
             print(f"Error writing summary: {e}")
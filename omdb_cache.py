@@ -0,0 +1,135 @@
+# omdb_cache.py
+import json
+import os
+import re
+import time
+import logging
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase a title, drop accents and reduce punctuation to single spaces"""
+    title = unicodedata.normalize("NFKD", title)
+    title = "".join(char for char in title if not unicodedata.combining(char))
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", title.lower()).split())
+
+
+def normalize_key(title: str, year: Optional[str] = None) -> str:
+    """Build a cache key from a title and an optional year"""
+    return f"{normalize_title(title)}|{year or ''}"
+
+
+def id_key(imdb_id: str) -> str:
+    """Cache key for a lookup by IMDb ID; can't clash with a title key"""
+    return f"#{imdb_id}"
+
+
+class ResponseCache:
+    """Persistent OMDB response cache with TTL and LRU eviction.
+
+    Positive answers are kept for ``ttl`` seconds, "Response: False" answers
+    for ``negative_ttl`` seconds. Once more than ``max_entries`` are stored the
+    least recently used entries are dropped.
+    """
+
+    def __init__(
+        self,
+        cache_path: Path,
+        ttl: float = 30 * 24 * 3600,
+        negative_ttl: float = 7 * 24 * 3600,
+        max_entries: int = 20000,
+    ):
+        self.cache_path = Path(cache_path)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.logger = logging.getLogger(__name__)
+        self.entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        """Load cached responses from disk"""
+        if not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                stored = json.load(f)
+            for key, entry in stored.get("entries", []):
+                self.entries[key] = entry
+        except Exception as e:
+            self.logger.error(f"Error loading cache {self.cache_path}: {str(e)}")
+            self.entries.clear()
+
+    def save(self):
+        """Write the cache to disk if it changed"""
+        if not self._dirty:
+            return
+        tmp_path = self.cache_path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"version": 1, "entries": list(self.entries.items())},
+                    f,
+                    ensure_ascii=False,
+                )
+            os.replace(tmp_path, self.cache_path)
+            self._dirty = False
+        except Exception as e:
+            self.logger.error(f"Error saving cache {self.cache_path}: {str(e)}")
+
+    def get(
+        self, title: str, year: Optional[str] = None, count: bool = True
+    ) -> Tuple[bool, Optional[Dict]]:
+        """Return (hit, data); data is None for cached negative results.
+
+        With ``count`` unset the hit/miss counters are left alone, for
+        callers that try several keys for one lookup and count it themselves.
+        """
+        return self._get(normalize_key(title, year), count)
+
+    def get_id(self, imdb_id: str, count: bool = True) -> Tuple[bool, Optional[Dict]]:
+        """Return (hit, data) for a lookup by IMDb ID"""
+        return self._get(id_key(imdb_id), count)
+
+    def count(self, hit: bool):
+        """Count one lookup as a hit or a miss"""
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def _get(self, key: str, count: bool = True) -> Tuple[bool, Optional[Dict]]:
+        entry = self.entries.get(key)
+        hit = False
+        if entry is not None:
+            ttl = self.ttl if entry["data"] is not None else self.negative_ttl
+            if time.time() - entry["stored"] <= ttl:
+                self.entries.move_to_end(key)
+                hit = True
+            else:
+                del self.entries[key]
+                self._dirty = True
+        if count:
+            self.count(hit)
+        return (True, entry["data"]) if hit else (False, None)
+
+    def put(self, title: str, year: Optional[str], data: Optional[Dict]):
+        """Store a response; pass None to cache a "Response: False" answer"""
+        self._put(normalize_key(title, year), data)
+
+    def put_id(self, imdb_id: str, data: Optional[Dict]):
+        """Store the response to a lookup by IMDb ID"""
+        self._put(id_key(imdb_id), data)
+
+    def _put(self, key: str, data: Optional[Dict]):
+        self.entries[key] = {"stored": time.time(), "data": data}
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        self._dirty = True
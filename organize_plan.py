@@ -0,0 +1,92 @@
+# organize_plan.py
+import os
+import json
+import time
+from collections import Counter
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# What will happen to a planned folder
+ORGANIZE = "organize"  # metadata is cached, moves into its genre folder
+MANUAL = "manual"  # cached as unknown or no usable genre, goes to Manual Checking
+NEEDS_FETCH = "needs_fetch"  # not in the cache; a normal run has to look it up
+UNPARSED = "unparsed"  # no title in the folder name, stays where it is
+
+# Why a planned operation would be unsafe to apply
+RENAME_TARGET_EXISTS = "rename_target_exists"
+DUPLICATE_RENAME = "duplicate_rename"
+DESTINATION_EXISTS = "destination_exists"
+DUPLICATE_DESTINATION = "duplicate_destination"
+
+
+@dataclass
+class PlannedMovie:
+    """Everything a run would do to one top-level folder"""
+
+    source: str
+    renamed: str
+    status: str
+    title: Optional[str] = None
+    year: Optional[str] = None
+    genre: Optional[str] = None
+    destination: Optional[str] = None
+    imdb_id: Optional[str] = None
+    collisions: List[str] = field(default_factory=list)
+    data: Optional[Dict] = None
+
+
+@dataclass
+class Plan:
+    """A complete, serializable organize plan for one library"""
+
+    root: str
+    incremental: bool = False
+    created: float = field(default_factory=time.time)
+    movies: List[PlannedMovie] = field(default_factory=list)
+
+    def counts(self) -> Dict[str, int]:
+        """Number of folders per status"""
+        return dict(Counter(movie.status for movie in self.movies))
+
+    def fetches_needed(self) -> List[str]:
+        """Titles a normal run would still have to look up"""
+        return [m.title for m in self.movies if m.status == NEEDS_FETCH]
+
+    def collisions(self) -> List[PlannedMovie]:
+        return [m for m in self.movies if m.collisions]
+
+    def summary(self) -> Dict:
+        return {
+            "total": len(self.movies),
+            "renames": sum(1 for m in self.movies if m.renamed != m.source),
+            "collisions": len(self.collisions()),
+            "fetches_needed": len(self.fetches_needed()),
+            **self.counts(),
+        }
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Plan":
+        movies = [PlannedMovie(**movie) for movie in data.get("movies", [])]
+        return cls(
+            root=data["root"],
+            incremental=data.get("incremental", False),
+            created=data.get("created", time.time()),
+            movies=movies,
+        )
+
+    def save(self, path: Path):
+        """Write the plan as JSON, atomically"""
+        path = Path(path)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "Plan":
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
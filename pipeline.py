@@ -0,0 +1,153 @@
+# pipeline.py
+import time
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, List, Optional
+
+from fetch_scheduler import QuotaExhausted
+from run_control import Cancelled, RunControl
+
+_DONE = object()
+
+
+@dataclass
+class Stage:
+    name: str
+    handler: Callable[[Any], Awaitable[Optional[Any]]]
+    workers: int = 1
+    interruptible: bool = False
+    processed: int = 0
+    expected: int = 0
+    dropped: int = 0
+    failed: List[Any] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    # Seconds spent in the handler, summed over workers
+    busy: float = 0.0
+
+
+class Pipeline:
+    """Chain of async stages connected by bounded queues.
+
+    Each item flows through the stages on its own, so disk and network work
+    for different movies overlap. A handler returns the (possibly updated)
+    item to pass it on, or None to drop it from the rest of the pipeline.
+    Progress is reported per stage after every item.
+
+    Workers wait at a checkpoint of the RunControl before each item. Once
+    the run is cancelled the remaining items are drained unprocessed;
+    handlers of ``interruptible`` stages are abandoned mid-way.
+    """
+
+    def __init__(
+        self,
+        progress_callback: Callable = None,
+        queue_size: int = 32,
+        control: Optional[RunControl] = None,
+    ):
+        self.progress_callback = progress_callback or (lambda x, y: None)
+        self.queue_size = queue_size
+        self.control = control or RunControl()
+        self.stages: List[Stage] = []
+        self.logger = logging.getLogger(__name__)
+
+    def add_stage(
+        self,
+        name: str,
+        handler: Callable,
+        workers: int = 1,
+        interruptible: bool = False,
+    ) -> "Pipeline":
+        self.stages.append(Stage(name, handler, max(1, workers), interruptible))
+        return self
+
+    def _drop(self, index: int):
+        """An item left the pipeline at stage ``index``; later stages expect less"""
+        for stage in self.stages[index + 1 :]:
+            stage.expected -= 1
+            self._report(stage)
+
+    def _report(self, stage: Stage):
+        if stage.expected > 0:
+            self.progress_callback(stage.name, stage.processed / stage.expected * 100)
+        else:
+            self.progress_callback(stage.name, 100)
+
+    async def _run_stage(self, index: int, inbox: asyncio.Queue, outbox, results):
+        stage = self.stages[index]
+
+        async def work():
+            while True:
+                item = await inbox.get()
+                if item is _DONE:
+                    return
+                started = time.monotonic()
+                try:
+                    await self.control.checkpoint()
+                    if stage.interruptible:
+                        result = await self.control.interruptible(stage.handler(item))
+                    else:
+                        result = await stage.handler(item)
+                except Cancelled:
+                    continue
+                except QuotaExhausted:
+                    result = None
+                except Exception as e:
+                    self.logger.error(f"Error in {stage.name} stage for {item}: {e}")
+                    stage.failed.append(item)
+                    stage.errors.append(str(e))
+                    result = None
+                finally:
+                    stage.busy += time.monotonic() - started
+                stage.processed += 1
+                self._report(stage)
+                if result is None:
+                    stage.dropped += 1
+                    self._drop(index)
+                elif outbox is None:
+                    results.append(result)
+                else:
+                    await outbox.put(result)
+
+        await asyncio.gather(*[work() for _ in range(stage.workers)])
+        if outbox is not None:
+            for _ in range(self.stages[index + 1].workers):
+                await outbox.put(_DONE)
+
+    async def run(self, items) -> List[Any]:
+        """Push ``items`` through every stage and return what came out the end"""
+        items = list(items)
+        if not self.stages:
+            return items
+        for stage in self.stages:
+            stage.expected = len(items)
+            stage.processed = 0
+            stage.dropped = 0
+            stage.failed = []
+            stage.errors = []
+            stage.busy = 0.0
+
+        queues = [asyncio.Queue(self.queue_size) for _ in self.stages]
+        results: List[Any] = []
+
+        async def feed():
+            for item in items:
+                if self.control.cancelled:
+                    break
+                await queues[0].put(item)
+            for _ in range(self.stages[0].workers):
+                await queues[0].put(_DONE)
+
+        await asyncio.gather(
+            feed(),
+            *[
+                self._run_stage(
+                    i,
+                    queues[i],
+                    queues[i + 1] if i + 1 < len(self.stages) else None,
+                    results,
+                )
+                for i in range(len(self.stages))
+            ],
+        )
+        return results
@@ -0,0 +1,170 @@
+# poster_service.py
+from PySide6.QtCore import Qt, QObject, QRunnable, QThreadPool, Signal
+from PySide6.QtGui import QImage
+import asyncio
+import threading
+import aiohttp
+from thumbnail_store import thumbnail_path, generate_thumbnail
+
+
+class DecodeJob(QRunnable):
+    """Decode (and if needed scale) one poster into a QImage on a worker"""
+
+    def __init__(self, service, key, source, size, data=None):
+        super().__init__()
+        self.service = service
+        self.key = key
+        self.source = source
+        self.size = size
+        self.data = data
+
+    def run(self):
+        image = None
+        try:
+            if self.service.is_wanted(self.key):
+                image = self.decode()
+        except Exception as e:
+            print(f"Error decoding poster {self.source}: {e}")
+        self.service.finish(self.key, image)
+
+    def decode(self):
+        if self.data is None:
+            # Local poster: decode the pre-scaled thumbnail, making it first
+            thumb = thumbnail_path(self.source, self.size)
+            if not thumb.exists():
+                thumb = generate_thumbnail(self.source, self.size)
+            if thumb:
+                return QImage(str(thumb))
+            return None
+
+        image = QImage()
+        if not image.loadFromData(self.data):
+            return None
+        return image.scaled(*self.size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+
+class PosterService(QObject):
+    """Shared poster loader for every tile and dialog.
+
+    Downloads run on one background event loop with one pooled aiohttp
+    session; decoding happens on a bounded QThreadPool and produces QImages,
+    so the GUI thread only converts finished images to pixmaps. Requests
+    for the same poster and size are coalesced, and a poster nobody waits
+    for any more is cancelled. ``poster_ready`` fires with (key, image);
+    the image is null when the poster could not be loaded.
+    """
+
+    poster_ready = Signal(str, QImage)
+    _instance = None
+
+    def __init__(self, max_downloads=6, decode_threads=4, parent=None):
+        super().__init__(parent)
+        self.max_downloads = max_downloads
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(decode_threads)
+        self.lock = threading.Lock()
+        self.waiters = {}
+        self.downloads = {}
+        self.loop = None
+        self.thread = None
+        self.session = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def _ensure_loop(self):
+        if self.loop is None:
+            self.loop = asyncio.new_event_loop()
+            self.thread = threading.Thread(
+                target=self.loop.run_forever, name="poster-service", daemon=True
+            )
+            self.thread.start()
+
+    async def _download(self, url):
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_downloads)
+            )
+        async with self.session.get(url) as response:
+            if response.status == 200:
+                return await response.read()
+        return None
+
+    @staticmethod
+    def key_for(source, size):
+        return f"{source}@{size[0]}x{size[1]}"
+
+    def request(self, requester, source, size):
+        """Ask for a poster (local path or URL) at ``size``; returns its key"""
+        size = tuple(size)
+        key = self.key_for(source, size)
+        with self.lock:
+            if key in self.waiters:
+                self.waiters[key].add(requester)
+                return key
+            self.waiters[key] = {requester}
+
+        source = str(source)
+        if source.startswith(("http://", "https://")):
+            self._ensure_loop()
+            future = asyncio.run_coroutine_threadsafe(self._download(source), self.loop)
+            with self.lock:
+                self.downloads[key] = future
+            future.add_done_callback(
+                lambda f: self._downloaded(key, source, size, f)
+            )
+        else:
+            self.pool.start(DecodeJob(self, key, source, size))
+        return key
+
+    def _downloaded(self, key, source, size, future):
+        with self.lock:
+            self.downloads.pop(key, None)
+        if future.cancelled():
+            return self.finish(key, None)
+        try:
+            data = future.result()
+        except Exception as e:
+            print(f"Error loading poster {source}: {e}")
+            data = None
+        if data is None:
+            return self.finish(key, None)
+        self.pool.start(DecodeJob(self, key, source, size, data))
+
+    def cancel(self, requester, key):
+        """Drop interest in a poster; the work stops if nobody else wants it"""
+        with self.lock:
+            waiting = self.waiters.get(key)
+            if waiting is None:
+                return
+            waiting.discard(requester)
+            if waiting:
+                return
+            del self.waiters[key]
+            future = self.downloads.pop(key, None)
+        if future is not None:
+            future.cancel()
+
+    def is_wanted(self, key):
+        with self.lock:
+            return key in self.waiters
+
+    def finish(self, key, image):
+        with self.lock:
+            wanted = self.waiters.pop(key, None)
+        if wanted:
+            self.poster_ready.emit(key, image if image is not None else QImage())
+
+    def shutdown(self):
+        """Close the shared session and stop the download loop"""
+        if self.loop is None:
+            return
+        if self.session is not None:
+            asyncio.run_coroutine_threadsafe(self.session.close(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+        self.loop = None
+        self.session = None
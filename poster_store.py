@@ -0,0 +1,221 @@
+# poster_store.py
+import os
+import re
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import threading
+import aiofiles
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+CHUNK_SIZE = 64 * 1024
+IMDB_ID = re.compile(r"^tt\d+$")
+# Pre-scaled copies made by thumbnail_store, named "<poster stem>_<w>x<h>.jpg"
+THUMBS_DIR = "thumbs"
+
+
+def poster_key(url: str, imdb_id: Optional[str] = None) -> str:
+    """Key a poster is stored under: the IMDb ID, else a hash of its URL"""
+    if imdb_id and IMDB_ID.match(imdb_id):
+        return imdb_id
+    return hashlib.sha1(url.encode()).hexdigest()
+
+
+def poster_extension(url: str) -> str:
+    extension = url.split("?")[0].rsplit(".", 1)[-1].lower()
+    return extension if extension in ("jpg", "jpeg", "png") else "jpg"
+
+
+class PosterStore:
+    """Posters shared by every folder showing the same movie.
+
+    Files live in ``movies info/posters`` named by IMDb ID (or URL hash),
+    so duplicates and renamed folders reuse one download. ``index.json``
+    keeps each poster's URL, validators and the folders referring to it.
+    Posters older than ``max_age`` are revalidated with a conditional
+    request instead of downloaded again, and ``collect`` removes posters no
+    folder refers to any more. Thumbnails of a poster go whenever the
+    poster is replaced or removed.
+    """
+
+    def __init__(self, posters_dir: Path, max_age: float = 30 * 24 * 3600):
+        self.posters_dir = Path(posters_dir)
+        self.index_path = self.posters_dir / "index.json"
+        self.max_age = max_age
+        self.logger = logging.getLogger(__name__)
+        self.entries: Dict[str, Dict] = {}
+        self.downloads = 0
+        self.revalidated = 0
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._dirty = False
+        self.posters_dir.mkdir(parents=True, exist_ok=True)
+        self.load()
+
+    def load(self):
+        """Load the poster index from disk"""
+        if not self.index_path.exists():
+            return
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                self.entries = json.load(f).get("entries", {})
+        except Exception as e:
+            self.logger.error(f"Error loading poster index {self.index_path}: {e}")
+            self.entries = {}
+
+    def save(self):
+        """Write the index to disk if it changed"""
+        if not self._dirty:
+            return
+        tmp_path = self.index_path.with_suffix(".tmp")
+        try:
+            with self._lock:
+                entries = json.loads(json.dumps(self.entries))
+                self._dirty = False
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "entries": entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.index_path)
+        except Exception as e:
+            self.logger.error(f"Error saving poster index {self.index_path}: {e}")
+
+    def add_ref(self, key: str, folder: str):
+        with self._lock:
+            refs = self.entries[key].setdefault("refs", [])
+            if folder not in refs:
+                refs.append(folder)
+                self._dirty = True
+
+    async def fetch(
+        self, session, url: str, folder: str, imdb_id: Optional[str] = None
+    ) -> Optional[Path]:
+        """Local copy of the poster at ``url`` for ``folder``, or None"""
+        if not url or url == "N/A":
+            return None
+        key = poster_key(url, imdb_id)
+        # Duplicates of one movie in the same run share a single request
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch(session, url, key))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        try:
+            path = await asyncio.shield(future)
+        except Exception as e:
+            self.logger.error(f"Error downloading poster for {folder}: {e}")
+            return None
+        if path:
+            self.add_ref(key, folder)
+        return path
+
+    async def _fetch(self, session, url: str, key: str) -> Optional[Path]:
+        entry = self.entries.get(key)
+        headers = {}
+        if (
+            entry
+            and entry["url"] == url
+            and (self.posters_dir / entry["file"]).exists()
+        ):
+            if time.time() - entry.get("checked", 0) <= self.max_age:
+                return self.posters_dir / entry["file"]
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        async with session.get(url, headers=headers) as response:
+            if response.status == 304 and headers:
+                self.revalidated += 1
+                with self._lock:
+                    entry["checked"] = time.time()
+                    self._dirty = True
+                return self.posters_dir / entry["file"]
+            if response.status != 200:
+                return None
+
+            file_name = f"{key}.{poster_extension(url)}"
+            poster_path = self.posters_dir / file_name
+            tmp_path = poster_path.with_name(poster_path.name + ".part")
+            replaced = key in self.entries or poster_path.exists()
+            try:
+                async with aiofiles.open(tmp_path, "wb") as f:
+                    async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                        await f.write(chunk)
+                os.replace(tmp_path, poster_path)
+            except BaseException:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+                raise
+            self.downloads += 1
+
+        with self._lock:
+            old = self.entries.get(key)
+            if old and old["file"] != file_name:
+                (self.posters_dir / old["file"]).unlink(missing_ok=True)
+            self.entries[key] = {
+                "url": url,
+                "file": file_name,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "checked": time.time(),
+                "refs": old.get("refs", []) if old else [],
+            }
+            self._dirty = True
+        if replaced:
+            self._remove_thumbnails(key)
+        return poster_path
+
+    def _remove_thumbnails(self, stem: str):
+        """Delete the pre-scaled copies of the poster stored as ``stem``"""
+        for thumb in (self.posters_dir / THUMBS_DIR).glob(f"{stem}_*"):
+            try:
+                thumb.unlink()
+            except OSError as e:
+                self.logger.error(f"Error removing thumbnail {thumb}: {e}")
+
+    def collect(self, live_folders: Iterable[str], keep: Iterable[str] = ()) -> int:
+        """Delete posters no live folder refers to; returns how many went.
+
+        References to folders not in ``live_folders`` are dropped first.
+        Files in the posters folder that aren't in the index, like posters
+        from before the store existed, are removed unless listed in ``keep``.
+        """
+        live = set(live_folders)
+        keep = {Path(p).name for p in keep}
+        removed = 0
+        with self._lock:
+            for key in list(self.entries):
+                entry = self.entries[key]
+                refs = [folder for folder in entry.get("refs", []) if folder in live]
+                if refs != entry.get("refs", []):
+                    entry["refs"] = refs
+                    self._dirty = True
+                if not refs and entry["file"] not in keep:
+                    del self.entries[key]
+                    self._dirty = True
+            indexed = {entry["file"] for entry in self.entries.values()}
+        for path in self.posters_dir.iterdir():
+            if path == self.index_path or not path.is_file():
+                continue
+            if path.name in indexed or path.name in keep:
+                continue
+            try:
+                path.unlink()
+                removed += 1
+            except OSError as e:
+                self.logger.error(f"Error removing poster {path}: {e}")
+        # Thumbnails of posters that are gone, or never were indexed, go too
+        stems = {Path(name).stem for name in indexed | keep}
+        thumbs_dir = self.posters_dir / THUMBS_DIR
+        if thumbs_dir.is_dir():
+            for thumb in thumbs_dir.iterdir():
+                if thumb.name.rsplit("_", 1)[0] in stems:
+                    continue
+                try:
+                    thumb.unlink()
+                except OSError as e:
+                    self.logger.error(f"Error removing thumbnail {thumb}: {e}")
+        self.save()
+        return removed
@@ -0,0 +1,158 @@
+# release_parser.py
+import os
+import json
+import logging
+import threading
+import guessit
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+
+def guess_release(name: str) -> Dict:
+    """Run guessit on a release name and keep only the fields we use"""
+    movie_data = guessit.guessit(name)
+    result = {}
+    if "title" in movie_data:
+        result["title"] = str(movie_data["title"])
+    if "screen_size" in movie_data:
+        result["screen_size"] = str(movie_data["screen_size"])
+    if "year" in movie_data:
+        result["year"] = int(movie_data["year"])
+    return result
+
+
+class ParseCache:
+    """Memoized guessit parsing with an LRU in memory and an optional file.
+
+    Stored in ``movies info/parse_cache.json`` next to the library manifest,
+    so a warm scan never calls guessit. ``parse_many`` fans cold names out
+    to a process pool when there are enough of them to pay for it; pass a
+    "spawn" ``mp_context`` from processes where forking isn't safe, like
+    one running Qt.
+    """
+
+    def __init__(
+        self,
+        cache_path: Optional[Path] = None,
+        max_entries: int = 50000,
+        process_threshold: int = 200,
+        mp_context=None,
+    ):
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.max_entries = max_entries
+        self.process_threshold = process_threshold
+        self.mp_context = mp_context
+        self.logger = logging.getLogger(__name__)
+        self.entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        """Load cached parse results from disk"""
+        if not self.cache_path or not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                stored = json.load(f)
+            for name, result in stored.get("entries", []):
+                self.entries[name] = result
+        except Exception as e:
+            self.logger.error(f"Error loading parse cache {self.cache_path}: {e}")
+            self.entries.clear()
+
+    def save(self):
+        """Write the cache to disk if it changed"""
+        if not self.cache_path or not self._dirty:
+            return
+        tmp_path = self.cache_path.with_suffix(".tmp")
+        try:
+            with self._lock:
+                entries = list(self.entries.items())
+                self._dirty = False
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "entries": entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            self.logger.error(f"Error saving parse cache {self.cache_path}: {e}")
+
+    def _store(self, name: str, result: Dict):
+        with self._lock:
+            self.entries[name] = result
+            self.entries.move_to_end(name)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self._dirty = True
+
+    def _lookup(self, name: str) -> Optional[Dict]:
+        with self._lock:
+            result = self.entries.get(name)
+            if result is not None:
+                self.entries.move_to_end(name)
+            return result
+
+    def parse(self, name: str) -> Dict:
+        """Parse a single release name, using the cache when possible"""
+        result = self._lookup(name)
+        if result is None:
+            result = guess_release(name)
+            self._store(name, result)
+        return result
+
+    def parse_many(
+        self,
+        names: Iterable[str],
+        workers: int = None,
+        should_stop: Optional[Callable[[], bool]] = None,
+    ) -> Dict[str, Dict]:
+        """Parse many names at once, spreading cold ones across processes.
+
+        ``should_stop`` is checked between results; once it returns True the
+        names parsed so far are returned and the rest are skipped.
+        """
+        should_stop = should_stop or (lambda: False)
+        names = list(dict.fromkeys(names))
+        results = {}
+        missing = []
+        for name in names:
+            result = self._lookup(name)
+            if result is None:
+                missing.append(name)
+            else:
+                results[name] = result
+
+        parsed = []
+        if len(missing) >= self.process_threshold:
+            workers = workers or os.cpu_count() or 1
+            # Small chunks keep stopping quick
+            chunksize = max(1, min(len(missing) // (workers * 4), 32))
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=self.mp_context)
+            stopped = False
+            try:
+                for result in pool.map(guess_release, missing, chunksize=chunksize):
+                    if should_stop():
+                        stopped = True
+                        break
+                    parsed.append(result)
+            finally:
+                pool.shutdown(wait=not stopped, cancel_futures=True)
+        else:
+            for name in missing:
+                if should_stop():
+                    break
+                parsed.append(guess_release(name))
+
+        for name, result in zip(missing, parsed):
+            self._store(name, result)
+            results[name] = result
+        return results
+
+
+QUALITY_LEVELS = {"2160p": 4, "1080p": 3, "720p": 2, "576p": 1, "480p": 0}
+
+
+def quality_level(parsed: Dict) -> int:
+    """Numerical quality of a parse result, -1 when unknown"""
+    return QUALITY_LEVELS.get(parsed.get("screen_size", ""), -1)
@@ -0,0 +1,66 @@
+# run_control.py
+import asyncio
+import threading
+from typing import Awaitable, TypeVar
+
+T = TypeVar("T")
+
+# How often paused or interruptible work looks at the control again
+POLL_INTERVAL = 0.1
+
+
+class Cancelled(Exception):
+    """Raised at a safe point once a run has been cancelled"""
+
+
+class RunControl:
+    """Cancel and pause switches for an organizer run.
+
+    Set from any thread (the GUI, a signal handler) and checked by the run
+    at safe points: between items, never in the middle of a move. Work that
+    is safe to abandon, like an OMDB request, can be wrapped with
+    ``interruptible`` so cancelling doesn't wait for it.
+    """
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def paused(self) -> bool:
+        return not self._running.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+        # A paused run has to wake up to notice
+        self._running.set()
+
+    def pause(self):
+        if not self.cancelled:
+            self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    async def checkpoint(self):
+        """Wait while paused; raise Cancelled once cancelled"""
+        while not self._running.is_set():
+            await asyncio.sleep(POLL_INTERVAL)
+        if self.cancelled:
+            raise Cancelled()
+
+    async def interruptible(self, awaitable: Awaitable[T]) -> T:
+        """Await something, abandoning it if the run is cancelled meanwhile"""
+        task = asyncio.ensure_future(awaitable)
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=POLL_INTERVAL)
+            if done:
+                return task.result()
+            if self.cancelled:
+                task.cancel()
+                raise Cancelled()
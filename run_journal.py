@@ -0,0 +1,206 @@
+# run_journal.py
+import os
+import json
+import errno
+import shutil
+import logging
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+def _remove(path: Path):
+    if path.is_dir():
+        shutil.rmtree(str(path))
+    else:
+        path.unlink()
+
+
+@dataclass
+class JournaledMove:
+    id: int
+    src: str
+    dst: str
+    copied: bool = False
+    done: bool = False
+
+
+@dataclass
+class JournalState:
+    """What an interrupted run had done when it stopped"""
+
+    moves: List[JournaledMove] = field(default_factory=list)
+    # Folder name -> OMDB details fetched for it
+    fetches: Dict[str, Dict] = field(default_factory=dict)
+    # (title, year, details) in fetch order, for refilling the response cache
+    responses: List[tuple] = field(default_factory=list)
+
+
+class RunJournal:
+    """Write-ahead journal of the moves and fetches of one organizer run.
+
+    Lives in ``movies info/run_journal.jsonl``. A move is logged (and
+    fsynced) before it touches the disk and marked done afterwards;
+    cross-device moves also log when the copy is complete, before the
+    source is deleted. A run that finishes removes the journal, so a
+    journal found on start-up means the last run was interrupted: it can
+    be recovered (finish or undo half-done moves, keep fetched details) and
+    resumed, or rolled back.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._file = None
+        self._next_id = 0
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def _write(self, record: Dict, sync: bool = False):
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+            if sync:
+                os.fsync(self._file.fileno())
+
+    def begin_run(self, root: Path, **info):
+        """Start a fresh journal for a new run"""
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._next_id = 0
+        self._write({"op": "run", "root": str(root), **info}, sync=True)
+
+    def finish(self):
+        """The run completed; nothing needs recovering"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def close(self):
+        """Stop journaling but keep the file for the next run to recover"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def log_fetch(self, folder: str, title: str, year: Optional[str], details):
+        self._write(
+            {
+                "op": "fetch",
+                "folder": folder,
+                "title": title,
+                "year": year,
+                "data": details,
+            }
+        )
+
+    def move(self, src: Path, dst: Path):
+        """Move a folder, journaling each step so a crash can be recovered"""
+        with self._lock:
+            move_id = self._next_id
+            self._next_id += 1
+        self._write(
+            {"op": "move", "id": move_id, "src": str(src), "dst": str(dst)}, sync=True
+        )
+        if dst.exists():
+            _remove(dst)
+        try:
+            os.rename(src, dst)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            if src.is_dir():
+                shutil.copytree(str(src), str(dst), symlinks=True)
+            else:
+                shutil.copy2(str(src), str(dst))
+            self._write({"op": "copied", "id": move_id}, sync=True)
+            _remove(src)
+        self._write({"op": "moved", "id": move_id})
+
+    def read(self) -> JournalState:
+        """Parse the journal left behind by an interrupted run"""
+        state = JournalState()
+        moves: Dict[int, JournaledMove] = {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Torn last line from the crash
+                        continue
+                    op = record.get("op")
+                    if op == "move":
+                        moves[record["id"]] = JournaledMove(
+                            record["id"], record["src"], record["dst"]
+                        )
+                    elif op == "copied" and record["id"] in moves:
+                        moves[record["id"]].copied = True
+                    elif op == "moved" and record["id"] in moves:
+                        moves[record["id"]].done = True
+                    elif op == "fetch":
+                        state.fetches[record["folder"]] = record["data"]
+                        state.responses.append(
+                            (record["title"], record["year"], record["data"])
+                        )
+        except FileNotFoundError:
+            pass
+        state.moves = sorted(moves.values(), key=lambda m: m.id)
+        return state
+
+    def recover(self) -> JournalState:
+        """Bring half-done moves of an interrupted run to a consistent state.
+
+        Same-device moves are a single rename and are either done or not.
+        A cross-device move whose copy finished is completed; one whose
+        copy was cut short has the partial copy removed. Returns the
+        journal state with every move's ``done`` flag matching the disk.
+        """
+        state = self.read()
+        for move in state.moves:
+            src, dst = Path(move.src), Path(move.dst)
+            if move.done:
+                continue
+            if move.copied:
+                if src.exists():
+                    _remove(src)
+                move.done = True
+            elif src.exists():
+                if dst.exists():
+                    self.logger.info(f"Removing partial copy {dst}")
+                    _remove(dst)
+            elif dst.exists():
+                move.done = True
+            else:
+                self.logger.error(f"Lost track of {src} (was moving to {dst})")
+        return state
+
+    def rollback(self) -> int:
+        """Undo the moves of an interrupted run, newest first.
+
+        Folders that a move replaced can't be brought back. Returns the
+        number of moves undone and removes the journal.
+        """
+        state = self.recover()
+        undone = 0
+        for move in reversed(state.moves):
+            src, dst = Path(move.src), Path(move.dst)
+            if not move.done or not dst.exists() or src.exists():
+                continue
+            try:
+                src.parent.mkdir(parents=True, exist_ok=True)
+                shutil.move(str(dst), str(src))
+                undone += 1
+            except Exception as e:
+                self.logger.error(f"Error moving {dst} back to {src}: {e}")
+        self.finish()
+        return undone
@@ -0,0 +1,207 @@
+# search_index.py
+import re
+import bisect
+import threading
+import unicodedata
+from typing import Dict, Hashable, List, Optional, Set
+
+# Searchable OMDB fields and how much a match in each one counts
+FIELD_WEIGHTS = {"Title": 5, "Director": 3, "Actors": 3, "Genre": 2, "Plot": 1}
+# Fields whose words get typo-tolerant matching (Plot is too large for it)
+FUZZY_FIELDS = ("Title", "Director", "Actors", "Genre")
+MIN_FUZZY_LENGTH = 4
+MAX_PREFIX_EXPANSION = 100
+# Shorter queries only match whole words, so callers shouldn't filter on them
+MIN_QUERY_LENGTH = 2
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, strip accents and split text into words"""
+    text = unicodedata.normalize("NFKD", str(text or ""))
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    return [t for t in re.split(r"[^a-z0-9]+", text) if t]
+
+
+def _deletions(token: str) -> Set[str]:
+    return {token[:i] + token[i + 1 :] for i in range(len(token))}
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """True if a and b differ by one insert, delete, substitution or swap"""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) == len(b):
+        diffs = [i for i in range(len(a)) if a[i] != b[i]]
+        if (
+            len(diffs) == 2
+            and diffs[1] == diffs[0] + 1
+            and a[diffs[0]] == b[diffs[1]]
+            and a[diffs[1]] == b[diffs[0]]
+        ):
+            return True
+    if len(a) > len(b):
+        a, b = b, a
+    i = j = edits = 0
+    while i < len(a) and j < len(b):
+        if a[i] != b[j]:
+            edits += 1
+            if edits > 1:
+                return False
+            if len(a) == len(b):
+                i += 1
+        else:
+            i += 1
+        j += 1
+    return edits + (len(b) - j) + (len(a) - i) <= 1
+
+
+class SearchIndex:
+    """In-memory inverted index over saved OMDB fields.
+
+    Supports exact, prefix and one-typo matches, and can be updated one
+    movie at a time. Every query word must match; results are ranked by
+    the summed field weights of the matches. Safe to update from a loader
+    thread while the GUI thread searches.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.postings: Dict[str, Dict[Hashable, int]] = {}
+        self.doc_tokens: Dict[Hashable, Set[str]] = {}
+        self.fuzzy_tokens: Set[str] = set()
+        self.deletes: Dict[str, Set[str]] = {}
+        self._sorted_tokens: List[str] = []
+        self._sorted_dirty = False
+
+    def __len__(self):
+        return len(self.doc_tokens)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.doc_tokens
+
+    def add(self, doc_id: Hashable, data: Optional[Dict], extra_text: str = ""):
+        """Index (or re-index) one movie"""
+        with self._lock:
+            if doc_id in self.doc_tokens:
+                self.remove(doc_id)
+            data = data or {}
+            weights: Dict[str, int] = {}
+            for field, weight in FIELD_WEIGHTS.items():
+                for token in tokenize(data.get(field, "")):
+                    weights[token] = max(weights.get(token, 0), weight)
+                    if field in FUZZY_FIELDS:
+                        self._add_fuzzy(token)
+            for token in tokenize(extra_text):
+                weights.setdefault(token, FIELD_WEIGHTS["Title"])
+                self._add_fuzzy(token)
+
+            for token, weight in weights.items():
+                if token not in self.postings:
+                    self.postings[token] = {}
+                    self._sorted_dirty = True
+                self.postings[token][doc_id] = weight
+            self.doc_tokens[doc_id] = set(weights)
+
+    def _add_fuzzy(self, token: str):
+        if len(token) < MIN_FUZZY_LENGTH or token in self.fuzzy_tokens:
+            return
+        self.fuzzy_tokens.add(token)
+        for variant in _deletions(token):
+            self.deletes.setdefault(variant, set()).add(token)
+
+    def remove(self, doc_id: Hashable):
+        """Drop one movie from the index"""
+        with self._lock:
+            for token in self.doc_tokens.pop(doc_id, ()):
+                docs = self.postings.get(token)
+                if docs is None:
+                    continue
+                docs.pop(doc_id, None)
+                if not docs:
+                    del self.postings[token]
+                    self._sorted_dirty = True
+                    if token in self.fuzzy_tokens:
+                        self.fuzzy_tokens.discard(token)
+                        for variant in _deletions(token):
+                            variants = self.deletes.get(variant)
+                            if variants is not None:
+                                variants.discard(token)
+                                if not variants:
+                                    del self.deletes[variant]
+
+    def sync(self, documents: Dict[Hashable, Optional[Dict]], extra_text=None):
+        """Add new documents and drop ones that disappeared"""
+        with self._lock:
+            for doc_id in [d for d in self.doc_tokens if d not in documents]:
+                self.remove(doc_id)
+            for doc_id, data in documents.items():
+                if doc_id not in self.doc_tokens:
+                    self.add(doc_id, data, extra_text(doc_id) if extra_text else "")
+
+    def retain(self, doc_ids):
+        """Drop every document not in doc_ids"""
+        doc_ids = set(doc_ids)
+        with self._lock:
+            for doc_id in [d for d in self.doc_tokens if d not in doc_ids]:
+                self.remove(doc_id)
+
+    def _prefix_matches(self, prefix: str) -> List[str]:
+        if self._sorted_dirty:
+            self._sorted_tokens = sorted(self.postings)
+            self._sorted_dirty = False
+        start = bisect.bisect_left(self._sorted_tokens, prefix)
+        matches = []
+        for token in self._sorted_tokens[start : start + MAX_PREFIX_EXPANSION]:
+            if not token.startswith(prefix):
+                break
+            matches.append(token)
+        return matches
+
+    def _fuzzy_matches(self, term: str) -> Set[str]:
+        if len(term) < MIN_FUZZY_LENGTH - 1:
+            return set()
+        candidates = set(self.deletes.get(term, ()))
+        for variant in _deletions(term):
+            if variant in self.fuzzy_tokens:
+                candidates.add(variant)
+            candidates.update(self.deletes.get(variant, ()))
+        return {c for c in candidates if c != term and _within_one_edit(c, term)}
+
+    def _term_scores(self, term: str) -> Dict[Hashable, int]:
+        scores: Dict[Hashable, int] = {}
+
+        def credit(token, factor):
+            for doc_id, weight in self.postings.get(token, {}).items():
+                score = weight * factor
+                if score > scores.get(doc_id, 0):
+                    scores[doc_id] = score
+
+        credit(term, 3)
+        # A single letter would expand to most of the vocabulary
+        if len(term) >= MIN_QUERY_LENGTH:
+            for token in self._prefix_matches(term):
+                if token != term:
+                    credit(token, 2)
+        for token in self._fuzzy_matches(term):
+            credit(token, 1)
+        return scores
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Hashable]:
+        """Return matching document ids, best match first"""
+        with self._lock:
+            terms = tokenize(query)
+            if not terms:
+                return []
+            totals: Optional[Dict[Hashable, int]] = None
+            for term in sorted(set(terms), key=len, reverse=True):
+                scores = self._term_scores(term)
+                if totals is None:
+                    totals = scores
+                else:
+                    totals = {
+                        d: s + scores[d] for d, s in totals.items() if d in scores
+                    }
+                if not totals:
+                    return []
+            ranked = sorted(totals, key=totals.get, reverse=True)
+            return ranked[:limit] if limit else ranked
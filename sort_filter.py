@@ -0,0 +1,126 @@
+# sort_filter.py
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass
+class MovieRecord:
+    """Typed sort/filter keys for one movie, computed once on load"""
+
+    path: Path
+    title: str
+    year: Optional[int] = None
+    rating: Optional[float] = None
+    runtime: Optional[int] = None
+    genres: Tuple[str, ...] = ()
+    quality: int = -1
+    added: float = 0.0
+
+    @property
+    def genre(self) -> Optional[str]:
+        """Main genre, as used for the genre folder"""
+        return self.genres[0].lower() if self.genres else None
+
+
+def _first_int(value) -> Optional[int]:
+    match = re.search(r"\d+", str(value or ""))
+    return int(match.group()) if match else None
+
+
+def _float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def build_record(
+    path: Path, data: Optional[Dict], quality: int = -1, added: float = 0.0
+) -> MovieRecord:
+    """Turn saved OMDB data into a MovieRecord"""
+    data = data or {}
+    genres = tuple(
+        g.strip() for g in data.get("Genre", "").split(",") if g.strip() and g != "N/A"
+    )
+    return MovieRecord(
+        path=Path(path),
+        title=(data.get("Title") or Path(path).name).lower(),
+        year=_first_int(data.get("Year")),
+        rating=_float(data.get("imdbRating")),
+        runtime=_first_int(data.get("Runtime")),
+        genres=genres,
+        quality=quality,
+        added=added,
+    )
+
+
+@dataclass
+class MovieFilter:
+    genre: Optional[str] = None
+    year_min: Optional[int] = None
+    year_max: Optional[int] = None
+    min_rating: Optional[float] = None
+    quality: Optional[int] = None
+
+    def matches(self, record: MovieRecord) -> bool:
+        if self.genre and self.genre not in record.genres:
+            return False
+        if self.year_min is not None and (record.year or 0) < self.year_min:
+            return False
+        if self.year_max is not None and (record.year or 0) > self.year_max:
+            return False
+        if self.min_rating is not None and (record.rating or 0) < self.min_rating:
+            return False
+        if self.quality is not None and record.quality != self.quality:
+            return False
+        return True
+
+
+# Sort choices offered by the browser: (field, descending) pairs, most
+# significant first. Ties always fall back to the title.
+SORT_OPTIONS = {
+    "Name": [("title", False)],
+    "Genre": [("genre", False), ("title", False)],
+    "Year": [("year", False), ("title", False)],
+    "Rating": [("rating", True), ("title", False)],
+    "Runtime": [("runtime", False), ("title", False)],
+    "Quality": [("quality", True), ("title", False)],
+    "Date Added": [("added", True), ("title", False)],
+}
+
+
+class SortFilterEngine:
+    """In-memory multi-key sorting and filtering over MovieRecords"""
+
+    def __init__(self, records: Iterable[MovieRecord] = ()):
+        self.records: List[MovieRecord] = list(records)
+
+    def set_records(self, records: Iterable[MovieRecord]):
+        self.records = list(records)
+
+    def genres(self) -> List[str]:
+        """Every genre present in the library"""
+        return sorted({g for record in self.records for g in record.genres})
+
+    def apply(
+        self,
+        sort_keys: List[Tuple[str, bool]],
+        movie_filter: Optional[MovieFilter] = None,
+    ) -> List[Path]:
+        """Return the paths that pass the filter, in sorted order"""
+        records = self.records
+        if movie_filter is not None:
+            records = [r for r in records if movie_filter.matches(r)]
+        else:
+            records = list(records)
+
+        # Stable sorts applied least significant key first; missing values
+        # always go last regardless of direction
+        for field, descending in reversed(sort_keys):
+            present = [r for r in records if getattr(r, field) is not None]
+            missing = [r for r in records if getattr(r, field) is None]
+            present.sort(key=lambda r: getattr(r, field), reverse=descending)
+            records = present + missing
+        return [record.path for record in records]
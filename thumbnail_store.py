@@ -0,0 +1,29 @@
+# thumbnail_store.py
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage
+from pathlib import Path
+
+TILE_SIZE = (180, 240)
+DIALOG_SIZE = (300, 450)
+
+
+def thumbnail_path(poster_path, size):
+    """Location of the pre-scaled copy of a poster at the given size"""
+    poster_path = Path(poster_path)
+    width, height = size
+    return poster_path.parent / "thumbs" / f"{poster_path.stem}_{width}x{height}.jpg"
+
+
+def generate_thumbnail(poster_path, size):
+    """Scale a poster down once and save it next to the original"""
+    target = thumbnail_path(poster_path, size)
+    image = QImage(str(poster_path))
+    if image.isNull():
+        return None
+    target.parent.mkdir(exist_ok=True)
+    scaled = image.scaled(*size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    tmp_path = target.with_suffix(".tmp.jpg")
+    if not scaled.save(str(tmp_path), "JPG", 90):
+        return None
+    tmp_path.replace(target)
+    return target
@@ -0,0 +1,211 @@
+# title_index.py
+import re
+import csv
+import gzip
+import json
+import sqlite3
+import logging
+import threading
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from omdb_cache import normalize_title
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS titles (
+    title TEXT NOT NULL,
+    year TEXT NOT NULL,
+    imdb_id TEXT NOT NULL,
+    source TEXT NOT NULL,
+    PRIMARY KEY (title, year)
+);
+"""
+
+# IMDb title types worth resolving folder names to
+IMDB_TYPES = {"movie", "tvMovie", "tvSeries", "tvMiniSeries"}
+
+# Search results whose title is less alike than this are never picked
+MIN_TITLE_SIMILARITY = 0.8
+
+
+def year_of(value) -> Optional[int]:
+    """First four-digit year in an OMDB or guessit year value"""
+    match = re.search(r"\d{4}", str(value or ""))
+    return int(match.group()) if match else None
+
+
+def rank_candidates(
+    title: str, year: Optional[str], candidates: Iterable[Dict]
+) -> Optional[Dict]:
+    """Pick the OMDB search result that best matches a parsed folder name.
+
+    Titles are compared after normalization; with a known year, results
+    more than a year off are ruled out and exact years win. Returns None
+    when nothing is close enough.
+    """
+    wanted_title = normalize_title(title)
+    wanted_year = year_of(year)
+    best, best_score = None, 0.0
+    for candidate in candidates:
+        similarity = SequenceMatcher(
+            None, wanted_title, normalize_title(candidate.get("Title", ""))
+        ).ratio()
+        if similarity < MIN_TITLE_SIMILARITY:
+            continue
+        score = similarity
+        if wanted_year is not None:
+            candidate_year = year_of(candidate.get("Year"))
+            if candidate_year is None or abs(candidate_year - wanted_year) > 1:
+                continue
+            score += 1.0 if candidate_year == wanted_year else 0.5
+        if candidate.get("Type") == "movie":
+            score += 0.1
+        if score > best_score:
+            best, best_score = candidate, score
+    return best
+
+
+class TitleIndex:
+    """Resolutions of (title, year) to IMDb IDs.
+
+    Lives in ``movies info/title_index.db``. Every successful lookup pins
+    the ID it found, so later runs fetch by ID instead of repeating the
+    fuzzy title match. Offline IMDb or OMDB dumps can be imported to fill
+    the index before anything is fetched; pins from lookups take priority
+    over imported rows.
+    """
+
+    def __init__(self, db_path: Path, read_only: bool = False):
+        self.db_path = Path(db_path)
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        if read_only:
+            # Not immutable: another run may be writing to the index
+            self._conn = sqlite3.connect(
+                f"{self.db_path.as_uri()}?mode=ro", uri=True, check_same_thread=False
+            )
+            return
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def resolve(self, title: str, year: Optional[str] = None) -> Optional[str]:
+        """Pinned IMDb ID for a title, or None if it isn't known for sure.
+
+        A missing year matches only a title pinned without one, or a title
+        with a single known ID; a given year must match exactly, since
+        films sharing a title a year apart are different films.
+        """
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT year, imdb_id FROM titles WHERE title = ?",
+                    (normalize_title(title),),
+                ).fetchall()
+        except sqlite3.OperationalError as e:
+            # A read-only index another run hasn't finished creating
+            self.logger.error(f"Error reading title index {self.db_path}: {e}")
+            return None
+        if not rows:
+            return None
+        # An empty ID marks a title and year that an import found ambiguous
+        years = dict(rows)
+        wanted = year_of(year)
+        if wanted is not None:
+            return years.get(str(wanted)) or None
+        if "" in years:
+            return years[""] or None
+        ids = set(years.values())
+        found = ids.pop() if len(ids) == 1 else None
+        return found or None
+
+    def pin(self, title: str, year: Optional[str], imdb_id: str):
+        """Remember what a looked-up title resolved to"""
+        self.pin_many([(title, year, imdb_id)])
+
+    def pin_many(
+        self, items: Iterable[Tuple[str, Optional[str], str]], source: str = "omdb"
+    ) -> int:
+        """Store several resolutions in one transaction.
+
+        Lookup pins replace earlier rows. Imported rows never replace a
+        lookup pin, and a title and year imported with two different IDs
+        is marked ambiguous so it gets looked up instead.
+        """
+        rows = [
+            (normalize_title(title), str(year_of(year) or ""), imdb_id, source)
+            for title, year, imdb_id in items
+        ]
+        if source == "omdb":
+            sql = (
+                "INSERT OR REPLACE INTO titles (title, year, imdb_id, source) "
+                "VALUES (?, ?, ?, ?)"
+            )
+        else:
+            sql = (
+                "INSERT INTO titles (title, year, imdb_id, source) "
+                "VALUES (?, ?, ?, ?) ON CONFLICT (title, year) DO UPDATE "
+                "SET imdb_id = '' WHERE source != 'omdb' "
+                "AND imdb_id != excluded.imdb_id"
+            )
+        with self._lock, self._conn:
+            self._conn.executemany(sql, rows)
+        return len(rows)
+
+    def import_dump(self, path: Path) -> Tuple[int, List[Dict]]:
+        """Import an offline dump; returns (rows indexed, OMDB records read).
+
+        Understands IMDb's ``title.basics.tsv`` (optionally gzipped), which
+        gives IDs only, and OMDB responses as a JSON array or one object
+        per line, which also come back so their details can be cached.
+        """
+        path = Path(path)
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            first = f.readline()
+            f.seek(0)
+            if first.startswith("tconst\t"):
+                return self._import_imdb(f), []
+            return self._import_omdb(f)
+
+    def _import_imdb(self, f) -> int:
+        imported = 0
+        batch = []
+        reader = csv.DictReader(f, delimiter="\t", quoting=csv.QUOTE_NONE)
+        for row in reader:
+            if row.get("titleType") not in IMDB_TYPES:
+                continue
+            year = row.get("startYear")
+            year = None if year in (None, "\\N") else year
+            batch.append((row["primaryTitle"], year, row["tconst"]))
+            if row.get("originalTitle") not in (None, "\\N", row["primaryTitle"]):
+                batch.append((row["originalTitle"], year, row["tconst"]))
+            if len(batch) >= 10000:
+                imported += self.pin_many(batch, source="dump")
+                batch = []
+        imported += self.pin_many(batch, source="dump")
+        return imported
+
+    def _import_omdb(self, f) -> Tuple[int, List[Dict]]:
+        text = f.read().strip()
+        if text.startswith("["):
+            records = json.loads(text)
+        else:
+            records = [json.loads(line) for line in text.splitlines() if line.strip()]
+        records = [
+            record
+            for record in records
+            if record.get("imdbID")
+            and record.get("Title")
+            and record.get("Response", "True") == "True"
+        ]
+        imported = self.pin_many(
+            ((r["Title"], r.get("Year"), r["imdbID"]) for r in records), source="dump"
+        )
+        return imported, records